@@ -1,14 +1,41 @@
 import os
-import jwt
+import time
+import threading
+import click
+import atexit
+import hashlib
+import uuid
+import functools
+import bisect
+import string
+import sqlite3
+import sys
+import queue
+import logging
+import logging.handlers
+import contextvars
+from contextlib import contextmanager
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta, timezone
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_cors import CORS
-from groq import Groq
+from sqlalchemy import event, func, inspect, or_, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool
 import json
 import re
 import random
+from dataclasses import dataclass, fields
+
+try:
+    import orjson
+except ImportError:
+    # Optional: a faster JSON encoder for resume responses
+    orjson = None
 
 # --- App Initialization & Configuration ---
 app = Flask(__name__)
@@ -30,6 +57,226 @@ CORS(app,
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-super-secret-key-change-this')
 app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///mydatabase.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Connection pool for Postgres/MySQL; DB_NULL_POOL opens a connection per checkout, for serverless instances
+app.config['DB_POOL_SIZE'] = int(os.environ.get('DB_POOL_SIZE', 5))
+app.config['DB_MAX_OVERFLOW'] = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+app.config['DB_POOL_TIMEOUT'] = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+app.config['DB_POOL_RECYCLE'] = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+app.config['DB_POOL_PRE_PING'] = os.environ.get('DB_POOL_PRE_PING', '1').lower() in ('1', 'true', 'yes')
+app.config['DB_NULL_POOL'] = os.environ.get('DB_NULL_POOL', '0').lower() in ('1', 'true', 'yes')
+# SQLite: write-ahead log so readers do not block the writer, and seconds a writer waits for the lock
+app.config['SQLITE_WAL'] = os.environ.get('SQLITE_WAL', '1').lower() in ('1', 'true', 'yes')
+app.config['SQLITE_BUSY_TIMEOUT'] = float(os.environ.get('SQLITE_BUSY_TIMEOUT', 15))
+# Number of stored questions per (skill, level, difficulty) before the LLM stops being called
+app.config['SKILL_QUESTION_POOL_SIZE'] = int(os.environ.get('SKILL_QUESTION_POOL_SIZE', 20))
+app.config['SKILL_QUESTION_CACHE_SIZE'] = int(os.environ.get('SKILL_QUESTION_CACHE_SIZE', 4096))
+# Background threads that top up pools below SKILL_QUESTION_POOL_SIZE; 0 only generates for empty pools
+app.config['SKILL_QUESTION_REFILL_WORKERS'] = int(os.environ.get('SKILL_QUESTION_REFILL_WORKERS', 2))
+# Skill attempts are buffered and written in bulk every interval or once this many rows are pending
+app.config['SKILL_ATTEMPT_FLUSH_INTERVAL'] = float(os.environ.get('SKILL_ATTEMPT_FLUSH_INTERVAL', 2.0))
+app.config['SKILL_ATTEMPT_FLUSH_SIZE'] = int(os.environ.get('SKILL_ATTEMPT_FLUSH_SIZE', 500))
+# Consecutive failed flushes after which the buffered attempts are logged and dropped
+app.config['SKILL_ATTEMPT_MAX_FLUSH_FAILURES'] = int(os.environ.get('SKILL_ATTEMPT_MAX_FLUSH_FAILURES', 5))
+# Shared LLM client: GROQ_BASE_URL can point at a local fake server
+app.config['LLM_TIMEOUT'] = float(os.environ.get('LLM_TIMEOUT', 30))
+app.config['LLM_MAX_CONNECTIONS'] = int(os.environ.get('LLM_MAX_CONNECTIONS', 20))
+app.config['LLM_MAX_RETRIES'] = int(os.environ.get('LLM_MAX_RETRIES', 2))
+app.config['LLM_BREAKER_THRESHOLD'] = int(os.environ.get('LLM_BREAKER_THRESHOLD', 5))
+app.config['LLM_BREAKER_COOLDOWN'] = float(os.environ.get('LLM_BREAKER_COOLDOWN', 30))
+# Resume response cache: memory (per process LRU), sql (shared ResponseCacheEntry table) or none
+app.config['RESUME_CACHE_BACKEND'] = os.environ.get('RESUME_CACHE_BACKEND', 'memory')
+app.config['RESUME_CACHE_TTL'] = int(os.environ.get('RESUME_CACHE_TTL', 24 * 3600))
+# Entries kept: the LRU size for memory, the row bound enforced by purges for sql
+app.config['RESUME_CACHE_SIZE'] = int(os.environ.get('RESUME_CACHE_SIZE', 512))
+# sql backend: on average one write in this many also purges expired and excess rows
+app.config['RESUME_CACHE_PURGE_EVERY'] = int(os.environ.get('RESUME_CACHE_PURGE_EVERY', 100))
+# In-process workers for async resume jobs; 0 leaves them to `flask run-resume-jobs`
+app.config['RESUME_JOB_WORKERS'] = int(os.environ.get('RESUME_JOB_WORKERS', 2))
+# bcrypt cost factor; stored hashes are upgraded on the next successful login after it changes
+app.config['BCRYPT_LOG_ROUNDS'] = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+# Password hashing pool: hashes running or queued beyond MAX_PENDING get a 503; 0 workers hashes inline
+app.config['PASSWORD_HASH_WORKERS'] = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+app.config['PASSWORD_HASH_MAX_PENDING'] = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 16))
+app.config['PASSWORD_HASH_TIMEOUT'] = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))
+# Access/refresh token lifetimes, and the per-process caches of verified token claims and users
+app.config['ACCESS_TOKEN_TTL'] = int(os.environ.get('ACCESS_TOKEN_TTL', 24 * 3600))
+app.config['REFRESH_TOKEN_TTL'] = int(os.environ.get('REFRESH_TOKEN_TTL', 30 * 24 * 3600))
+app.config['AUTH_CLAIMS_CACHE_SIZE'] = int(os.environ.get('AUTH_CLAIMS_CACHE_SIZE', 4096))
+app.config['AUTH_CLAIMS_CACHE_TTL'] = int(os.environ.get('AUTH_CLAIMS_CACHE_TTL', 300))
+app.config['AUTH_USER_CACHE_SIZE'] = int(os.environ.get('AUTH_USER_CACHE_SIZE', 1024))
+app.config['AUTH_USER_CACHE_TTL'] = int(os.environ.get('AUTH_USER_CACHE_TTL', 60))
+# Batch resume generation: workers, LLM requests per second and records per request
+app.config['BATCH_RESUME_WORKERS'] = int(os.environ.get('BATCH_RESUME_WORKERS', 4))
+app.config['BATCH_RESUME_RATE'] = float(os.environ.get('BATCH_RESUME_RATE', 2.0))
+app.config['BATCH_RESUME_MAX_RECORDS'] = int(os.environ.get('BATCH_RESUME_MAX_RECORDS', 500))
+# Seconds the health check waits for the database to answer SELECT 1
+app.config['HEALTH_DB_TIMEOUT'] = float(os.environ.get('HEALTH_DB_TIMEOUT', 2.0))
+# Create missing tables on the first request (default only for SQLite); otherwise run `flask init-db` once per deploy
+app.config['DB_AUTO_CREATE'] = os.environ.get(
+    'DB_AUTO_CREATE', '1' if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite') else '0'
+).lower() in ('1', 'true', 'yes')
+# Structured logs: level, share of requests whose full payloads are logged (redacted), and log queue bound
+app.config['LOG_LEVEL'] = os.environ.get('LOG_LEVEL', 'INFO').upper()
+app.config['LOG_PAYLOAD_SAMPLE_RATE'] = float(os.environ.get('LOG_PAYLOAD_SAMPLE_RATE', 0.01))
+app.config['LOG_QUEUE_SIZE'] = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+
+# ✅ STRUCTURED LOGGING
+# Request threads only enqueue records; formatting, redaction and stdout writes happen on the listener thread
+LOG_REDACTIONS = (
+    (re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+'), '[email]'),
+    # Not inside paths, ids or timestamps: /api/resumes/12345678901, job-12345678901, 2024-01-01 10:00:00
+    (re.compile(r'(?<![\w+/#-])\+?\(?\d(?:[\s().-]{0,2}\d){9,14}(?![\w/:-])'), '[phone]'),
+)
+
+request_id_var = contextvars.ContextVar('request_id', default=None)
+request_stages_var = contextvars.ContextVar('request_stages', default=None)
+payload_sampled_var = contextvars.ContextVar('payload_sampled', default=False)
+
+def redact(text):
+    """Mask email addresses and phone numbers"""
+    for pattern, replacement in LOG_REDACTIONS:
+        text = pattern.sub(replacement, text)
+    return text
+
+class JSONLogFormatter(logging.Formatter):
+    """One redacted JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+        }
+        if getattr(record, 'request_id', None):
+            entry["request_id"] = record.request_id
+        # Only the message and fields are redacted, so timestamps and ids are never mistaken for phone numbers
+        entry["msg"] = redact(record.getMessage())
+        line = json.dumps(entry, ensure_ascii=False)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            line = line[:-1] + ', ' + redact(json.dumps(fields, ensure_ascii=False, default=str))[1:]
+        return line
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Tags records with the request id and drops them instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Message formatting is left to the listener thread
+        record.request_id = request_id_var.get()
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+log = logging.getLogger('intelliresume')
+log.setLevel(app.config['LOG_LEVEL'])
+log.propagate = False
+log_handler = DroppingQueueHandler(queue.Queue(maxsize=app.config['LOG_QUEUE_SIZE']))
+log_output = logging.StreamHandler(sys.stdout)
+log_output.setFormatter(JSONLogFormatter())
+log_listener = logging.handlers.QueueListener(log_handler.queue, log_output)
+log.addHandler(log_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+def log_event(message, level=logging.INFO, **fields):
+    """Log a message with structured fields"""
+    if log.isEnabledFor(level):
+        # Built directly: Logger.log would walk the stack to find the caller on every call
+        record = log.makeRecord(log.name, level, '(unknown file)', 0, message, (), None, extra={"fields": fields})
+        log.handle(record)
+
+def log_payload(message, **fields):
+    """Log full payloads, only for the sampled share of requests"""
+    if payload_sampled_var.get():
+        log_event(message, **fields)
+
+@contextmanager
+def timed_stage(name):
+    """Add the block's duration to the current request's stage timings"""
+    stages = request_stages_var.get()
+    if stages is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages[name] = stages.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+@app.before_request
+def start_request_log():
+    request_id = request.headers.get('X-Request-ID', '')[:64] or uuid.uuid4().hex
+    g.request_id = request_id
+    g.request_started = time.perf_counter()
+    request_id_var.set(request_id)
+    request_stages_var.set({})
+    payload_sampled_var.set(random.random() < app.config['LOG_PAYLOAD_SAMPLE_RATE'])
+
+@app.after_request
+def finish_request_log(response):
+    if 'request_id' not in g:
+        return response
+    stages = {name: round(ms, 1) for name, ms in request_stages_var.get().items()}
+    response.headers['X-Request-ID'] = g.request_id
+    if stages:
+        response.headers['Server-Timing'] = ', '.join(f"{name};dur={ms}" for name, ms in stages.items())
+    log_event(
+        "request",
+        method=request.method,
+        path=request.path,
+        status=response.status_code,
+        duration_ms=round((time.perf_counter() - g.request_started) * 1000, 1),
+        stages=stages,
+    )
+    return response
+
+@app.teardown_request
+def clear_request_log(exc=None):
+    # Threads are reused across requests; stop stage timings leaking into the next one
+    request_id_var.set(None)
+    request_stages_var.set(None)
+    payload_sampled_var.set(False)
+
+# ✅ DATABASE ENGINE (pooling, SQLite WAL)
+def database_engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured backend"""
+    if config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        # Pool sizing is left to Flask-SQLAlchemy's SQLite defaults (in-memory databases need StaticPool)
+        options = {"connect_args": {"timeout": config['SQLITE_BUSY_TIMEOUT']}}
+    elif config['DB_NULL_POOL']:
+        options = {}
+    else:
+        options = {
+            "pool_size": config['DB_POOL_SIZE'],
+            "max_overflow": config['DB_MAX_OVERFLOW'],
+            "pool_timeout": config['DB_POOL_TIMEOUT'],
+            "pool_recycle": config['DB_POOL_RECYCLE'],
+        }
+    if config['DB_NULL_POOL']:
+        options["poolclass"] = NullPool
+    options["pool_pre_ping"] = config['DB_POOL_PRE_PING']
+    return options
+
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = database_engine_options(app.config)
+
+@event.listens_for(Engine, 'connect')
+def configure_sqlite_connection(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    if app.config['SQLITE_WAL']:
+        cursor.execute('PRAGMA journal_mode=WAL')
+        # Safe with WAL: a crash can lose the last commits but never corrupts the database
+        cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute(f"PRAGMA busy_timeout={int(app.config['SQLITE_BUSY_TIMEOUT'] * 1000)}")
+    cursor.close()
 
 db = SQLAlchemy(app)
 bcrypt = Bcrypt(app)
@@ -40,7 +287,35 @@ class User(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(128), nullable=False)
 
+class StoredResume(db.Model):
+    # Current snapshot of a user's resume; its history lives in ResumeVersion
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    title = db.Column(db.String(200), nullable=False)
+    # The generation form, reused as context for section regeneration
+    form = db.Column(db.JSON, nullable=False)
+    data = db.Column(db.JSON, nullable=False)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class ResumeVersion(db.Model):
+    # Versions store only the sections they changed, with a full snapshot every RESUME_VERSION_SNAPSHOT_EVERY
+    __table_args__ = (
+        db.UniqueConstraint('resume_id', 'version', name='uq_resume_version_resume_version'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    resume_id = db.Column(db.Integer, db.ForeignKey('stored_resume.id'), nullable=False)
+    version = db.Column(db.Integer, nullable=False)
+    changes = db.Column(db.JSON, nullable=False)
+    reason = db.Column(db.String(50), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
 class SkillVerification(db.Model):
+    # One row per (user, skill, level) so attempt upserts touch a single row
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'skill', 'level', name='uq_skill_verification_user_skill_level'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     skill = db.Column(db.String(100), nullable=False)
@@ -51,38 +326,1034 @@ class SkillVerification(db.Model):
     verified_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+class ResponseCacheEntry(db.Model):
+    key = db.Column(db.String(64), primary_key=True)
+    value = db.Column(db.JSON, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class ResumeJob(db.Model):
+    id = db.Column(db.String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    # Only the user who created a job can read it; the payload and result hold their personal details
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), index=True)
+    idempotency_key = db.Column(db.String(255), unique=True)
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)  # queued, running, succeeded, failed
+    payload = db.Column(db.JSON, nullable=False)
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
 class SkillQuestion(db.Model):
+    # Questions are served from pools keyed by (skill, level, difficulty)
+    __table_args__ = (
+        db.Index('ix_skill_question_pool', 'skill', 'level', 'difficulty'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     skill = db.Column(db.String(100), nullable=False)
     level = db.Column(db.String(20), nullable=False)
+    difficulty = db.Column(db.String(20), nullable=False, default='basic')
     question = db.Column(db.Text, nullable=False)
     options = db.Column(db.JSON, nullable=False)
     correct_answer = db.Column(db.String(1), nullable=False)
     explanation = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+# ✅ DATABASE INITIALIZATION (explicit, never at import)
+class TableInitializer:
+    """Runs db.create_all() at most once per process, on first use"""
+
+    def __init__(self):
+        self.done = False
+        self._lock = threading.Lock()
+
+    def ensure(self):
+        if self.done:
+            return
+        with self._lock:
+            if not self.done:
+                db.create_all()
+                self.done = True
+
+table_initializer = TableInitializer()
+
+@app.before_request
+def auto_create_tables():
+    if app.config['DB_AUTO_CREATE']:
+        table_initializer.ensure()
+
+def has_unique_key(table_name, columns):
+    """Whether the live table has a unique constraint or unique index over exactly these columns"""
+    inspector = inspect(db.engine)
+    keys = inspector.get_unique_constraints(table_name) + [
+        index for index in inspector.get_indexes(table_name) if index.get('unique')
+    ]
+    return any(set(key['column_names']) == set(columns) for key in keys)
+
+def dedupe_skill_verifications():
+    """Merge duplicate (user_id, skill, level) rows into the oldest one; returns the number of rows removed"""
+    duplicates = db.session.query(SkillVerification.user_id, SkillVerification.skill, SkillVerification.level).group_by(
+        SkillVerification.user_id, SkillVerification.skill, SkillVerification.level
+    ).having(func.count(SkillVerification.id) > 1).all()
+    removed = 0
+    for user_id, skill, level in duplicates:
+        keep, *extra = SkillVerification.query.filter_by(user_id=user_id, skill=skill, level=level).order_by(SkillVerification.id).all()
+        for record in extra:
+            keep.attempts = (keep.attempts or 0) + (record.attempts or 0)
+            if record.last_attempt and (keep.last_attempt is None or record.last_attempt > keep.last_attempt):
+                keep.last_attempt = record.last_attempt
+            if record.verified_at and (keep.verified_at is None or record.verified_at < keep.verified_at):
+                keep.verified_at = record.verified_at
+            keep.is_verified = bool(keep.is_verified or record.is_verified)
+            db.session.delete(record)
+            removed += 1
+    db.session.commit()
+    return removed
+
+def migrate_skill_verification_unique_key():
+    """Add the (user_id, skill, level) unique key the attempt upsert relies on to tables created before it existed"""
+    columns = ['user_id', 'skill', 'level']
+    if has_unique_key(SkillVerification.__tablename__, columns):
+        return None
+    removed = dedupe_skill_verifications()
+    db.session.execute(text(
+        f"CREATE UNIQUE INDEX uq_skill_verification_user_skill_level ON {SkillVerification.__tablename__} ({', '.join(columns)})"
+    ))
+    db.session.commit()
+    return removed
+
+def has_column(table_name, column_name):
+    return any(column['name'] == column_name for column in inspect(db.engine).get_columns(table_name))
+
+def migrate_resume_job_owner():
+    """Add ResumeJob.user_id to tables created before jobs had owners; older jobs stay unreadable"""
+    table_name = ResumeJob.__tablename__
+    if has_column(table_name, 'user_id'):
+        return False
+    db.session.execute(text(f"ALTER TABLE {table_name} ADD COLUMN user_id INTEGER REFERENCES {User.__tablename__} (id)"))
+    db.session.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table_name}_user_id ON {table_name} (user_id)"))
+    db.session.commit()
+    return True
+
+def migrate_skill_question_difficulty():
+    """Add SkillQuestion.difficulty (and its pool index) to tables created before pools had difficulties"""
+    table_name = SkillQuestion.__tablename__
+    if has_column(table_name, 'difficulty'):
+        return False
+    # Every question stored before difficulties existed was generated for the default 'basic' pool
+    db.session.execute(text(f"ALTER TABLE {table_name} ADD COLUMN difficulty VARCHAR(20) NOT NULL DEFAULT 'basic'"))
+    db.session.execute(text(f"UPDATE {table_name} SET difficulty = 'basic' WHERE difficulty IS NULL"))
+    db.session.execute(text(f"CREATE INDEX IF NOT EXISTS ix_skill_question_pool ON {table_name} (skill, level, difficulty)"))
+    db.session.commit()
+    return True
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create any missing tables and migrate older ones. Run once per deploy, separately from serving."""
+    table_initializer.ensure()
+    if migrate_skill_question_difficulty():
+        click.echo("✅ Added the skill question difficulty column")
+    if migrate_resume_job_owner():
+        click.echo("✅ Added the resume job owner column")
+    removed = migrate_skill_verification_unique_key()
+    if removed is not None:
+        click.echo(f"✅ Added the skill verification unique key ({removed} duplicate rows merged)")
+    click.echo("✅ Database tables are ready")
+
+# ✅ DATABASE SESSIONS
+# Flask-SQLAlchemy removes the request's session (rolling back anything uncommitted) on app context teardown
+
+def release_db_connection():
+    """End the session's open transaction so its pooled connection is not held during a slow LLM call"""
+    if db.session().in_transaction():
+        db.session.commit()
+
+# Lowercased OperationalError messages of lock waits and lost connections (SQLite and Postgres)
+TRANSIENT_DATABASE_ERRORS = (
+    'database is locked',
+    'database table is locked',
+    'could not connect to server',
+    'connection refused',
+    'server closed the connection unexpectedly',
+    'terminating connection',
+    'lock timeout',
+)
+
+def is_transient_database_error(e):
+    """Pool timeouts, lock waits and dropped connections; schema errors such as "no such table" are not"""
+    if isinstance(e, PoolTimeoutError) or getattr(e, 'connection_invalidated', False):
+        return True
+    message = str(getattr(e, 'orig', e)).lower()
+    return any(text in message for text in TRANSIENT_DATABASE_ERRORS)
+
+@app.errorhandler(PoolTimeoutError)
+@app.errorhandler(OperationalError)
+def database_busy(e):
+    db.session.rollback()
+    if not is_transient_database_error(e):
+        # Permanent (missing table or column, bad SQL): retrying will not help
+        log_event("Database error", level=logging.ERROR, error=str(e))
+        return jsonify({"error": "Database error"}), 500
+    # Pool exhausted, database locked or unreachable: transient, so tell the client to retry
+    log_event("Database unavailable", level=logging.ERROR, error=str(e))
+    response = jsonify({"error": "Database is busy, please retry"})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+class LRUCache:
+    """Small thread-safe least-recently-used cache with optional per-entry TTL"""
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value, expires_at = self._data[key]
+            except KeyError:
+                return default
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = ttl if ttl is not None else self.ttl
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl if ttl is not None else None)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+# ✅ METRICS (Prometheus text format, per-thread shards)
+HTTP_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LLM_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+
+class MetricShard:
+    """Counters and histograms written by a single thread"""
+
+    def __init__(self, thread=None):
+        self.thread = thread
+        self.values = {}
+        self.histograms = {}
+
+    def merge(self, other):
+        for key, value in other.values.copy().items():
+            self.values[key] = self.values.get(key, 0) + value
+        for key, counts in other.histograms.copy().items():
+            merged = self.histograms.get(key)
+            if merged is None:
+                self.histograms[key] = list(counts)
+            else:
+                for i, count in enumerate(counts):
+                    merged[i] += count
+
+class MetricsRegistry:
+    """Prometheus counters, gauges and histograms without a lock on the hot path.
+
+    Every thread updates its own MetricShard; a scrape sums the shards.
+    Shards whose thread has exited are folded into a retired total on every
+    scrape and whenever the shard list doubles past `max_shards`, so
+    short-lived threads cannot grow it between scrapes. Labels are tuples
+    of (name, value) pairs.
+    """
+
+    def __init__(self, max_shards=64):
+        self.max_shards = max_shards
+        self._metrics = {}
+        self._collectors = []
+        self._local = threading.local()
+        self._shards = []
+        self._fold_at = max_shards
+        self._retired = MetricShard()
+        self._lock = threading.Lock()
+
+    def counter(self, name, help_text):
+        self._metrics[name] = ('counter', help_text, None)
+
+    def gauge(self, name, help_text):
+        self._metrics[name] = ('gauge', help_text, None)
+
+    def histogram(self, name, help_text, buckets):
+        self._metrics[name] = ('histogram', help_text, buckets)
+
+    def collector(self, fn):
+        """Register fn() -> [(name, type, help, [(labels, value), ...])], called on every scrape"""
+        self._collectors.append(fn)
+        return fn
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = MetricShard(threading.current_thread())
+            with self._lock:
+                self._shards.append(shard)
+                if len(self._shards) >= self._fold_at:
+                    self._fold_dead_shards()
+                    # Doubling keeps the folding cost amortized constant per new thread
+                    self._fold_at = max(self.max_shards, 2 * len(self._shards))
+            return shard
+
+    def _fold_dead_shards(self):
+        """Merge the shards of exited threads into the retired total; caller holds the lock"""
+        live = []
+        for shard in self._shards:
+            if shard.thread.is_alive():
+                live.append(shard)
+            else:
+                self._retired.merge(shard)
+        self._shards = live
+
+    def inc(self, name, labels=(), amount=1):
+        values = self._shard().values
+        key = (name, labels)
+        values[key] = values.get(key, 0) + amount
+
+    def observe(self, name, value, labels=()):
+        histograms = self._shard().histograms
+        key = (name, labels)
+        counts = histograms.get(key)
+        if counts is None:
+            # One slot per bucket, then +Inf, then the running sum
+            counts = histograms[key] = [0] * (len(self._metrics[name][2]) + 2)
+        counts[bisect.bisect_left(self._metrics[name][2], value)] += 1
+        counts[-1] += value
+
+    def snapshot(self):
+        with self._lock:
+            self._fold_dead_shards()
+            live = list(self._shards)
+            total = MetricShard()
+            total.merge(self._retired)
+        for shard in live:
+            total.merge(shard)
+        return total
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        total = self.snapshot()
+        samples = {}
+        for (name, labels), value in total.values.items():
+            samples.setdefault(name, []).append((labels, value))
+        for (name, labels), counts in total.histograms.items():
+            samples.setdefault(name, []).append((labels, counts))
+
+        lines = []
+        for name, (kind, help_text, buckets) in self._metrics.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(samples.get(name, ()), key=lambda sample: sample[0]):
+                if kind != 'histogram':
+                    lines.append(f"{name}{format_metric_labels(labels)} {value}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets + (float('inf'),), value):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f"{name}_bucket{format_metric_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{format_metric_labels(labels)} {value[-1]}")
+                lines.append(f"{name}_count{format_metric_labels(labels)} {cumulative}")
+        for collect in self._collectors:
+            for name, kind, help_text, values in collect():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.extend(f"{name}{format_metric_labels(labels)} {value}" for labels, value in values)
+        return '\n'.join(lines) + '\n'
+
+def format_metric_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        f'{name}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for name, value in labels
+    )
+    return '{' + ','.join(escaped) + '}'
+
+metrics = MetricsRegistry()
+metrics.histogram('http_request_duration_seconds', 'Request latency by route and method.', HTTP_LATENCY_BUCKETS)
+metrics.counter('http_requests_total', 'Requests by route, method and status.')
+metrics.gauge('http_requests_in_flight', 'Requests currently being handled, by route.')
+metrics.histogram('llm_request_duration_seconds', 'LLM provider call latency, retries included, by model and outcome.', LLM_LATENCY_BUCKETS)
+metrics.counter('llm_tokens_total', 'Tokens reported by the LLM provider, by model and kind (prompt or completion).')
+metrics.counter('json_extractions_total', 'extract_json_from_text calls by result (ok or failed).')
+metrics.counter('resume_generations_total', 'Resumes produced by generate_resume_data, by source (cache, llm or fallback).')
+metrics.counter('resume_fallbacks_total', 'Resumes built by the rule-based fallback instead of the LLM.')
+metrics.counter('skill_attempts_dropped_total', 'Buffered skill attempts dropped after repeated failed flushes.')
+
+@app.before_request
+def start_request_metrics():
+    # Templated rule, so /api/resumes/1 and /api/resumes/2 share a series
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    g.metrics_route = route
+    g.metrics_started = time.perf_counter()
+    metrics.inc('http_requests_in_flight', (('route', route),))
+
+@app.after_request
+def finish_request_metrics(response):
+    if 'metrics_route' in g:
+        labels = (('route', g.metrics_route), ('method', request.method))
+        metrics.observe('http_request_duration_seconds', time.perf_counter() - g.metrics_started, labels)
+        metrics.inc('http_requests_total', labels + (('status', str(response.status_code)),))
+    return response
+
+@app.teardown_request
+def clear_request_metrics(exc=None):
+    # Teardown runs after a streamed body is finished, so streams count as in flight until then
+    if 'metrics_route' in g:
+        metrics.inc('http_requests_in_flight', (('route', g.metrics_route),), -1)
+
+# ✅ JSON EXTRACTION (linear scan over LLM output)
+# Only these characters change the scanner state; everything else is skipped by the regex engine
+JSON_SIGNIFICANT_CHARS = re.compile(r'[{}\[\]",\\\u201c\u201d]')
+# Opening quote -> characters that close the string (LLMs sometimes write “smart quotes”)
+JSON_QUOTE_CLOSERS = {'"': '"', '\u201c': '\u201d"', '\u201d': '\u201d"'}
+
+class JSONObjectScanner:
+    """Brace- and string-aware scanner that finds balanced JSON objects in streamed text.
+
+    `feed` appends a chunk and returns the raw text of every top-level object
+    it completed. Each character is visited once across all chunks, and text
+    outside objects (code fences, chatter, stray brackets) is ignored.
+    """
+
+    def __init__(self):
+        self.text = ''
+        self._pos = 0
+        self._depth = 0
+        self._closing_quotes = None
+        self._skip_to = 0
+        self._start = None
+
+    def _member_end(self, end):
+        """Called at each comma that ends a top-level member"""
+
+    def _object_end(self, end):
+        """Called when the closing brace of an object is found"""
+
+    def scan(self, chunk):
+        """Like `feed`, but yields each object as soon as it closes"""
+        self.text += chunk
+        for match in JSON_SIGNIFICANT_CHARS.finditer(self.text, self._pos):
+            i = match.start()
+            if i < self._skip_to:
+                continue
+            char = match.group()
+            if self._closing_quotes is not None:
+                if char == '\\':
+                    self._skip_to = i + 2
+                elif char in self._closing_quotes:
+                    self._closing_quotes = None
+            elif char in JSON_QUOTE_CLOSERS:
+                if self._depth:
+                    self._closing_quotes = JSON_QUOTE_CLOSERS[char]
+            elif char == '{' or (char == '[' and self._depth):
+                if not self._depth:
+                    self._start = i
+                self._depth += 1
+            elif char in '}]' and self._depth:
+                self._depth -= 1
+                if not self._depth:
+                    self._object_end(i)
+                    self._pos = i + 1
+                    yield self.text[self._start:i + 1]
+            elif char == ',' and self._depth == 1:
+                self._member_end(i)
+        self._pos = len(self.text)
+
+    def feed(self, chunk):
+        return list(self.scan(chunk))
+
+def repair_json(raw):
+    """Fix the defects LLMs commonly add to JSON: smart-quoted strings and trailing commas"""
+    pieces = []
+    last = 0
+    closing_quotes = None
+    skip_to = 0
+    for match in JSON_SIGNIFICANT_CHARS.finditer(raw):
+        i = match.start()
+        if i < skip_to:
+            continue
+        char = match.group()
+        if closing_quotes is not None:
+            if char == '\\':
+                skip_to = i + 2
+            elif char in closing_quotes:
+                closing_quotes = None
+                if char != '"':
+                    pieces.append(raw[last:i] + '"')
+                    last = i + 1
+        elif char in JSON_QUOTE_CLOSERS:
+            closing_quotes = JSON_QUOTE_CLOSERS[char]
+            if char != '"':
+                pieces.append(raw[last:i] + '"')
+                last = i + 1
+        elif char in '}]':
+            j = i - 1
+            while j >= last and raw[j].isspace():
+                j -= 1
+            if j >= last and raw[j] == ',':
+                pieces.append(raw[last:j])
+                last = j + 1
+    pieces.append(raw[last:])
+    return ''.join(pieces)
+
+def parse_json_object(raw):
+    """json.loads that retries once after repair_json; returns None if the text is not a JSON object"""
+    for candidate in (raw, None):
+        try:
+            value = json.loads(candidate if candidate is not None else repair_json(raw))
+        except json.JSONDecodeError:
+            continue
+        return value if isinstance(value, dict) else None
+    return None
+
+def strip_code_fences(text):
+    """Body of the first ``` fenced block, or the text unchanged if there is none"""
+    fence = text.find('```')
+    if fence == -1:
+        return text
+    body_start = text.find('\n', fence)
+    if body_start == -1:
+        return text
+    body_end = text.find('```', body_start)
+    return text[body_start + 1:body_end if body_end != -1 else len(text)]
+
 def extract_json_from_text(text):
-    """Extract JSON from AI response text"""
+    """Extract the first JSON object from AI response text"""
+    value = find_json_object(text)
+    metrics.inc('json_extractions_total', (('result', 'ok' if value is not None else 'failed'),))
+    return value
+
+def find_json_object(text):
+    if not text:
+        return None
     try:
         return json.loads(text)
     except json.JSONDecodeError:
-        json_match = re.search(r'\{.*\}', text, re.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group())
-            except json.JSONDecodeError:
-                pass
+        pass
+    
+    fenced = strip_code_fences(text)
+    if fenced is not text:
+        try:
+            return json.loads(fenced)
+        except json.JSONDecodeError:
+            pass
+    for candidate in ((fenced, text) if fenced is not text else (text,)):
+        for raw in JSONObjectScanner().scan(candidate):
+            value = parse_json_object(raw)
+            if value is not None:
+                return value
+    return None
+
+# ✅ SHARED LLM CLIENT
+LLM_MODEL = "llama-3.1-8b-instant"
+
+class LLMUnavailableError(Exception):
+    """The LLM provider is not configured, failing, or the circuit breaker is open"""
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures and lets one trial call through after `reset_timeout`"""
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self._opened_at is None:
+            return 'closed'
+        return 'half-open' if time.monotonic() - self._opened_at >= self.reset_timeout else 'open'
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_in_flight or time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key onto the one already in flight"""
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def stats(self):
+        return {"calls": self.calls, "coalesced": self.coalesced}
+
+def llm_request_key(kwargs):
+    """Identity of a completion request: model, sampling settings and whitespace-normalized messages"""
+    normalized = {key: value for key, value in kwargs.items() if key != 'timeout'}
+    normalized['messages'] = [
+        dict(message, content=' '.join(str(message.get('content', '')).split()))
+        for message in kwargs.get('messages', [])
+    ]
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+class LLMClient:
+    """Process-wide Groq client with a bounded keep-alive connection pool.
+
+    Calls retry 429/5xx and connection errors with jittered exponential
+    backoff; repeated failures open a circuit breaker so callers can fall
+    back immediately instead of waiting on a degraded provider. Identical
+    concurrent requests share one provider call. `client`
+    lets any object with the Groq chat.completions.create interface be
+    wrapped, e.g. a local stub. The Groq SDK and its HTTP client are
+    imported and built on the first call, not at startup.
+    """
+
+    RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+    MAX_BACKOFF = 8.0
+
+    def __init__(self, api_key=None, base_url=None, client=None, timeout=30.0, max_connections=20,
+                 max_retries=2, backoff=0.5, breaker=None):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker(failure_threshold=5, reset_timeout=30.0)
+        self.single_flight = SingleFlight()
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self._client = client
+        self._client_lock = threading.Lock()
+
+    @property
+    def configured(self):
+        return self._client is not None or bool(self.api_key)
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self.build_client()
+        return self._client
+
+    def build_client(self):
+        import httpx
+        from groq import Groq
+        http_client = httpx.Client(
+            limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+            timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 5.0))
+        )
+        # Retries are handled here so they count towards the circuit breaker
+        return Groq(api_key=self.api_key, base_url=self.base_url, http_client=http_client, max_retries=0, timeout=self.timeout)
+
+    def is_retryable(self, error):
+        import httpx
+        from groq import APIConnectionError
+        if isinstance(error, (APIConnectionError, httpx.TransportError)):
+            return True
+        return getattr(error, 'status_code', None) in self.RETRYABLE_STATUS
+
+    def retry_delay(self, attempt, error):
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        try:
+            return min(float(retry_after), self.MAX_BACKOFF)
+        except (TypeError, ValueError):
+            return random.uniform(0, min(self.backoff * 2 ** attempt, self.MAX_BACKOFF))
+
+    def create(self, coalesce=None, **kwargs):
+        """chat.completions.create with retries; raises LLMUnavailableError when the provider is degraded.
+
+        Identical in-flight requests share one call only when they are
+        deterministic (temperature 0) or the caller passes coalesce=True;
+        sampled calls such as question generation must each get their own answer.
+        """
+        if coalesce is None:
+            coalesce = kwargs.get('temperature') == 0
+        if kwargs.get('stream') or not coalesce:
+            # A stream can only be consumed once, so it is never shared either
+            return self._create(**kwargs)
+        return self.single_flight.do(llm_request_key(kwargs), lambda: self._create(**kwargs))
+
+    def _create(self, **kwargs):
+        if not self.configured:
+            raise LLMUnavailableError("GROQ_API_KEY not set")
+        if not self.breaker.allow():
+            raise LLMUnavailableError("LLM circuit breaker is open")
+        kwargs.setdefault('timeout', self.timeout)
+        model = kwargs.get('model', '')
+        started = time.perf_counter()
+        outcome = 'error'
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    chat_completion = self.client.chat.completions.create(**kwargs)
+                except Exception as e:
+                    if not self.is_retryable(e):
+                        # Bad requests say nothing about provider health
+                        self.breaker.record_success()
+                        raise
+                    if attempt == self.max_retries:
+                        self.breaker.record_failure()
+                        outcome = 'unavailable'
+                        raise LLMUnavailableError(f"LLM call failed after {attempt + 1} attempts: {e}") from e
+                    time.sleep(self.retry_delay(attempt, e))
+                else:
+                    self.breaker.record_success()
+                    outcome = 'ok'
+                    self.record_usage(model, chat_completion)
+                    return chat_completion
+        finally:
+            metrics.observe('llm_request_duration_seconds', time.perf_counter() - started, (('model', model), ('outcome', outcome)))
+
+    def record_usage(self, model, chat_completion):
+        # Streams report no usage until they are consumed
+        usage = getattr(chat_completion, 'usage', None)
+        for kind in ('prompt', 'completion'):
+            tokens = getattr(usage, f'{kind}_tokens', None)
+            if tokens:
+                metrics.inc('llm_tokens_total', (('model', model), ('kind', kind)), tokens)
+
+    def stream(self, **kwargs):
+        """Yield the content deltas of a streamed completion.
+
+        Retries only cover opening the stream; a failure after the first
+        chunk raises LLMUnavailableError and counts against the breaker.
+        """
+        chunks = self.create(stream=True, **kwargs)
+        try:
+            for chunk in chunks:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        except Exception as e:
+            if not self.is_retryable(e):
+                raise
+            self.breaker.record_failure()
+            raise LLMUnavailableError(f"LLM stream interrupted: {e}") from e
+
+llm_client = LLMClient(
+    api_key=os.environ.get("GROQ_API_KEY"),
+    base_url=os.environ.get("GROQ_BASE_URL"),
+    timeout=app.config['LLM_TIMEOUT'],
+    max_connections=app.config['LLM_MAX_CONNECTIONS'],
+    max_retries=app.config['LLM_MAX_RETRIES'],
+    breaker=CircuitBreaker(app.config['LLM_BREAKER_THRESHOLD'], app.config['LLM_BREAKER_COOLDOWN'])
+)
+
+# ✅ RESUME RESPONSE CACHE
+class MemoryCacheBackend:
+    name = 'memory'
+
+    def __init__(self, maxsize, ttl):
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, value):
+        self._cache.set(key, value)
+
+class SQLCacheBackend:
+    """Entries shared by all workers through the ResponseCacheEntry table.
+
+    A random sample of writes purges expired rows and trims the table to
+    `max_entries`, dropping the entries closest to expiry first; `flask
+    purge-response-cache` does the same from cron.
+    """
+    name = 'sql'
+
+    def __init__(self, ttl, max_entries, purge_every=100):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.purge_every = purge_every
+
+    def get(self, key):
+        entry = db.session.get(ResponseCacheEntry, key)
+        if entry is None or entry.expires_at <= datetime.utcnow():
+            return None
+        return entry.value
+
+    def set(self, key, value):
+        now = datetime.utcnow()
+        db.session.merge(ResponseCacheEntry(key=key, value=value, created_at=now, expires_at=now + timedelta(seconds=self.ttl)))
+        db.session.commit()
+        if self.purge_every and random.randrange(self.purge_every) == 0:
+            self.purge()
+
+    def purge(self):
+        """Delete expired rows and the soonest-expiring rows beyond max_entries; returns the number deleted"""
+        deleted = ResponseCacheEntry.query.filter(ResponseCacheEntry.expires_at <= datetime.utcnow()).delete(synchronize_session=False)
+        cutoff = db.session.query(ResponseCacheEntry.expires_at).order_by(
+            ResponseCacheEntry.expires_at.desc()
+        ).offset(self.max_entries).limit(1).scalar()
+        if cutoff is not None:
+            deleted += ResponseCacheEntry.query.filter(ResponseCacheEntry.expires_at <= cutoff).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
+
+class ResponseCache:
+    """Content-addressed cache with hit/miss counters; backend failures count as misses"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key):
+        if self.backend is None:
+            return None
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            db.session.rollback()
+            log_event("Error reading response cache", level=logging.ERROR, error=str(e))
+            self._count('errors')
+            value = None
+        self._count('hits' if value is not None else 'misses')
+        return value
+
+    def set(self, key, value):
+        if self.backend is None:
+            return
+        try:
+            self.backend.set(key, value)
+        except Exception as e:
+            db.session.rollback()
+            log_event("Error writing response cache", level=logging.ERROR, error=str(e))
+            self._count('errors')
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name if self.backend is not None else 'none',
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+def create_cache_backend(kind, maxsize, ttl, purge_every=100):
+    if kind == 'memory':
+        return MemoryCacheBackend(maxsize, ttl)
+    if kind == 'sql':
+        return SQLCacheBackend(ttl, maxsize, purge_every)
     return None
 
+def normalize_cache_text(value):
+    if isinstance(value, (list, tuple)):
+        value = ', '.join(str(item) for item in value)
+    return ' '.join(str(value or '').split())
+
+RESUME_CACHE_FIELDS = ['prompt', 'stream', 'field', 'experienceLevel', 'targetRole', 'skills']
+# Contact details are part of the prompt too; keying on them keeps one user's details out of another's resume
+RESUME_CACHE_IDENTITY_FIELDS = ['fullName', 'email', 'phone', 'location', 'userType']
+
+def resume_cache_key(data, model):
+    """sha256 over the normalized form inputs and the model name"""
+    normalized = {field: normalize_cache_text(data.get(field)).casefold() for field in RESUME_CACHE_FIELDS}
+    normalized.update({field: normalize_cache_text(data.get(field)) for field in RESUME_CACHE_IDENTITY_FIELDS})
+    normalized['model'] = model
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode('utf-8')).hexdigest()
+
+resume_cache = ResponseCache(create_cache_backend(
+    app.config['RESUME_CACHE_BACKEND'], app.config['RESUME_CACHE_SIZE'], app.config['RESUME_CACHE_TTL'],
+    app.config['RESUME_CACHE_PURGE_EVERY']
+))
+
+@app.cli.command('purge-response-cache')
+def purge_response_cache_command():
+    """Delete expired and excess rows of the sql response cache (for cron)."""
+    if not isinstance(resume_cache.backend, SQLCacheBackend):
+        raise click.ClickException("RESUME_CACHE_BACKEND is not sql")
+    click.echo(f"✅ Purged {resume_cache.backend.purge()} response cache entries")
+
+class ResumeSectionParser(JSONObjectScanner):
+    """Incrementally parse a streamed JSON object into its top-level members.
+
+    `feed` returns the (key, value) pairs whose values became complete with
+    the new chunk, so each resume section can be used as soon as the LLM has
+    finished writing it. Text before the opening brace (code fences,
+    chatter) is ignored.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._member_start = None
+        self._members = []
+        self.finished = False
+
+    def _member_end(self, end):
+        start = self._member_start if self._member_start is not None else self._start + 1
+        member = self.text[start:end].strip()
+        self._member_start = end + 1
+        if member:
+            value = parse_json_object('{' + member + '}')
+            if value is not None:
+                self._members.extend(value.items())
+
+    def _object_end(self, end):
+        self._member_end(end)
+
+    def feed(self, chunk):
+        self._members = []
+        if self.finished:
+            self.text += chunk
+            return []
+        for _ in self.scan(chunk):
+            self.finished = True
+            break
+        return self._members
+
+# ✅ PROMPT KEYWORD CLASSIFIER (one tokenizing pass per prompt)
+# keyword -> (features it counts towards, spellings matched as whole words along with their regular inflections)
+PROMPT_KEYWORDS = {
+    'bca': (('education', 'title_tech', 'bca'), ['bca']),
+    'b.c.a': (('education', 'bca'), ['b.c.a']),
+    'bachelor': (('education',), ['bachelor', 'bachelors']),
+    'college': (('education',), ['college', 'colleges']),
+    'university': (('education',), ['university']),
+    'student': (('education',), ['student', 'students']),
+    'graduated': (('education',), ['graduated']),
+    'degree': (('education',), ['degree', 'degrees']),
+    'school': (('education',), ['school', 'schools', 'schooling']),
+    'education': (('education',), ['education', 'educational']),
+    'studied': (('education',), ['studied']),
+    'course': (('education',), ['course', 'courses', 'coursework']),
+    'academic': (('education',), ['academic', 'academics']),
+    'worked': (('experience',), ['worked']),
+    'job': (('experience',), ['job', 'jobs']),
+    'company': (('experience',), ['company']),
+    'experience': (('experience',), ['experience', 'experienced', 'experiences']),
+    'years': (('experience',), ['years']),
+    'intern': (('experience',), ['intern', 'interns', 'internship', 'internships']),
+    'role': (('experience',), ['role', 'roles']),
+    'responsibilities': (('experience',), ['responsibilities']),
+    'employed': (('experience',), ['employed']),
+    'professional': (('experience',), ['professional', 'professionals', 'professionally']),
+    'career': (('experience',), ['career', 'careers']),
+    'industry': (('experience',), ['industry']),
+    'computer': (('title_tech',), ['computer', 'computers']),
+    'software': (('title_tech',), ['software']),
+    'programming': (('title_tech',), ['programming']),
+    'engineering': (('title_engineering',), ['engineering']),
+    'engineer': (('title_engineering',), ['engineer', 'engineers']),
+    'business': (('title_business',), ['business']),
+    'management': (('title_business',), ['management']),
+    'mba': (('title_business',), ['mba']),
+    'design': (('title_design',), ['design', 'designer', 'designing']),
+    'creative': (('title_design',), ['creative']),
+    'art': (('title_design',), ['art', 'arts', 'artist']),
+    'medicaps': (('medicaps',), ['medicaps']),
+    'choithram': (('choithram',), ['choithram']),
+}
+
+def keyword_inflections(word):
+    """Regular plural, past, -ing and -er forms of a keyword ("design" -> "designs", "designed", "designing", ...)"""
+    if not word.isalpha() or len(word) < 3:
+        return []
+    stem = word[:-1] if word.endswith('e') else word
+    forms = [word + ('es' if word.endswith(('s', 'x', 'ch', 'sh')) else 's'), stem + 'ed', stem + 'ing', stem + 'er', stem + 'ers']
+    if word.endswith('y') and word[-2] not in 'aeiou':
+        forms += [word[:-1] + 'ies', word[:-1] + 'ied']
+    return forms
+
+# Listed spellings win over generated inflections ("engineering" is its own keyword, not a form of "engineer")
+PROMPT_KEYWORD_SPELLINGS = {
+    form: keyword for keyword, (_, spellings) in PROMPT_KEYWORDS.items() for spelling in spellings for form in keyword_inflections(spelling)
+}
+PROMPT_KEYWORD_SPELLINGS.update(
+    (spelling, keyword) for keyword, (_, spellings) in PROMPT_KEYWORDS.items() for spelling in spellings
+)
+# Punctuation becomes whitespace so split() yields whole words and "art" no longer matches "start"
+PROMPT_WORD_TABLE = str.maketrans({char: ' ' for char in string.punctuation + '‘’“”'})
+# Dotted spellings ("b.c.a") would be split apart, so they are checked as bounded phrases instead
+PROMPT_DOTTED_SPELLINGS = {
+    spelling: re.compile(r'(?<!\w)' + re.escape(spelling) + r'(?!\w)')
+    for spelling in PROMPT_KEYWORD_SPELLINGS if '.' in spelling
+}
+
+@functools.lru_cache(maxsize=256)
+def extract_prompt_features(text):
+    """Feature vector {feature: number of distinct keywords} from a single scan of the prompt.
+
+    The result is cached per prompt and must be treated as read-only.
+    """
+    lowered = text.lower()
+    words = set(lowered.translate(PROMPT_WORD_TABLE).split())
+    keywords = {PROMPT_KEYWORD_SPELLINGS[word] for word in words.intersection(PROMPT_KEYWORD_SPELLINGS)}
+    for spelling, pattern in PROMPT_DOTTED_SPELLINGS.items():
+        if spelling in lowered and pattern.search(lowered):
+            keywords.add(PROMPT_KEYWORD_SPELLINGS[spelling])
+
+    counts = {}
+    for keyword in keywords:
+        for feature in PROMPT_KEYWORDS[keyword][0]:
+            counts[feature] = counts.get(feature, 0) + 1
+    return counts
+
 def detect_content_type(user_input):
     """Detect if input is about education or experience"""
-    education_keywords = ['bca', 'b.c.a', 'bachelor', 'college', 'university', 'student', 'graduated', 'degree', 'school', 'education', 'studied', 'course', 'academic']
-    experience_keywords = ['worked', 'job', 'company', 'experience', 'years', 'intern', 'role', 'responsibilities', 'employed', 'professional', 'career', 'industry']
-    
-    input_lower = user_input.lower()
-    
-    education_score = sum(1 for keyword in education_keywords if keyword in input_lower)
-    experience_score = sum(1 for keyword in experience_keywords if keyword in input_lower)
+    features = extract_prompt_features(user_input)
+    education_score = features.get('education', 0)
+    experience_score = features.get('experience', 0)
     
     if education_score > experience_score:
         return 'education'
@@ -167,47 +1438,234 @@ SKILLS_DATABASE = {
     ]
 }
 
-def get_recommended_skills(field, experience_level, current_skills=[]):
-    """Get intelligent skill recommendations based on field and experience"""
-    recommended = []
-    
-    # Field-based recommendations
-    field_lower = field.lower() if field else ''
-    
-    if any(word in field_lower for word in ['computer', 'software', 'bca', 'engineering', 'technology']):
-        recommended.extend(SKILLS_DATABASE['technical'][:15])  # Top 15 technical skills
-        recommended.extend(SKILLS_DATABASE['soft_skills'][:10])  # Top 10 soft skills
-    
-    elif any(word in field_lower for word in ['business', 'management', 'commerce', 'mba']):
-        recommended.extend(SKILLS_DATABASE['business'][:15])
-        recommended.extend(SKILLS_DATABASE['soft_skills'][:10])
-    
-    elif any(word in field_lower for word in ['design', 'art', 'creative', 'media']):
-        recommended.extend(SKILLS_DATABASE['creative'][:15])
-        recommended.extend(SKILLS_DATABASE['soft_skills'][:10])
-    
-    else:
-        # Default recommendations for other fields
-        recommended.extend(SKILLS_DATABASE['soft_skills'][:15])
-        recommended.extend(['Microsoft Office', 'Communication', 'Problem Solving', 'Teamwork'])
-    
-    # Experience-based adjustments
-    if experience_level == 'Student':
-        recommended.extend(['Academic Research', 'Team Projects', 'Time Management', 'Learning Agility'])
-    elif experience_level == 'Fresher':
-        recommended.extend(['Quick Learning', 'Adaptability', 'Entry-Level Expertise', 'Professional Development'])
-    
-    # Remove duplicates and already existing skills
-    recommended = [skill for skill in recommended if skill not in current_skills]
+# ✅ SKILL INDEX (built once at import)
+def normalize_skill(skill):
+    """Case-insensitive, whitespace-insensitive key for a skill name"""
+    key = str(skill).strip().casefold()
+    return ' '.join(key.split()) if '  ' in key else key
+
+# normalized skill -> {"name": display name, "categories": [...]}
+SKILL_INDEX = {}
+for _category, _skills in SKILLS_DATABASE.items():
+    for _skill in _skills:
+        SKILL_INDEX.setdefault(normalize_skill(_skill), {"name": _skill, "categories": []})["categories"].append(_category)
+
+# ✅ SKILL CANONICALIZATION
+SKILL_TOKEN_PATTERN = re.compile(r'[a-z0-9+#]+')
+
+# Common spellings and abbreviations of catalog skills
+SKILL_ALIASES = {
+    'js': 'JavaScript', 'es6': 'JavaScript', 'ts': 'TypeScript', 'golang': 'Go', 'c plus plus': 'C++', 'cpp': 'C++',
+    'html': 'HTML5', 'css': 'CSS3', 'reactjs': 'React', 'react.js': 'React', 'angularjs': 'Angular',
+    'vue': 'Vue.js', 'vuejs': 'Vue.js', 'node': 'Node.js', 'nodejs': 'Node.js', 'express': 'Express.js',
+    'nextjs': 'Next.js', 'springboot': 'Spring Boot', 'postgres': 'PostgreSQL', 'mongo': 'MongoDB',
+    'ms sql': 'SQL Server', 'mssql': 'SQL Server', 'k8s': 'Kubernetes', 'gcp': 'Google Cloud',
+    'amazon web services': 'AWS', 'microsoft azure': 'Azure', 'ml': 'Machine Learning', 'dl': 'Deep Learning',
+    'nlp': 'Natural Language Processing', 'oop': 'Object-Oriented Programming', 'oops': 'Object-Oriented Programming',
+    'object oriented programming': 'Object-Oriented Programming', 'dsa': 'Data Structures', 'rest api': 'REST APIs',
+    'restful apis': 'REST APIs', 'ui/ux': 'UI/UX Design', 'ux design': 'UI/UX Design', 'photoshop': 'Adobe Photoshop',
+    'illustrator': 'Adobe Illustrator', 'team work': 'Teamwork', 'team player': 'Teamwork', 'powerbi': 'Power BI',
+}
+# Words that qualify a skill without changing it: "Python Programming" is Python, "SQL Database" is SQL.
+# Not "development" or "frameworks": "Java Frameworks" and "Web Development" are skills of their own
+SKILL_FILLER_TOKENS = {
+    'programming', 'language', 'languages', 'skill', 'skills', 'database', 'databases',
+    'basics', 'fundamentals', 'in', 'with', 'using', 'and',
+}
+
+def skill_token_key(tokens):
+    return ' '.join(sorted(tokens))
+
+def build_skill_canonical_map():
+    """Precompile exact, alias and token keys of the catalog to canonical skill names"""
+    canonical = {}
+    token_keys = {}
+    for key, entry in SKILL_INDEX.items():
+        canonical[key] = entry["name"]
+        token_keys.setdefault(skill_token_key(SKILL_TOKEN_PATTERN.findall(key)), entry["name"])
+    for alias, name in SKILL_ALIASES.items():
+        canonical[normalize_skill(alias)] = name
+    return canonical, token_keys
+
+SKILL_CANONICAL_NAMES, SKILL_CANONICAL_TOKEN_KEYS = build_skill_canonical_map()
+
+@functools.lru_cache(maxsize=8192)
+def canonical_skill(skill):
+    """(canonical id, display name) for a free-text skill.
+
+    Tries the exact catalog name, the alias table, the word set ("Design
+    Graphic"), then the word set without filler words ("Python Programming").
+    Filler words are only dropped when what remains is a catalog skill;
+    unknown skills keep their own text and are keyed by all of their words,
+    so "Web Development" and "Web Frameworks" stay apart.
+    """
+    key = normalize_skill(skill)
+    name = SKILL_CANONICAL_NAMES.get(key)
+    if name is None:
+        tokens = SKILL_TOKEN_PATTERN.findall(key)
+        name = SKILL_CANONICAL_TOKEN_KEYS.get(skill_token_key(tokens))
+        if name is None:
+            core_key = skill_token_key([token for token in tokens if token not in SKILL_FILLER_TOKENS])
+            name = SKILL_CANONICAL_NAMES.get(core_key) or SKILL_CANONICAL_TOKEN_KEYS.get(core_key) if core_key else None
+            if name is None:
+                return skill_token_key(tokens) or key, ' '.join(str(skill).split())
+    return normalize_skill(name), name
+
+def canonicalize_skills(skills):
+    """Map skills to canonical names and drop near-duplicates in one pass, keeping first-seen order"""
+    seen = set()
+    result = []
+    for skill in skills:
+        if not isinstance(skill, str) or not skill.strip():
+            continue
+        skill_id, name = canonical_skill(skill)
+        if skill_id not in seen:
+            seen.add(skill_id)
+            result.append(name)
+    return result
+
+# Field keywords -> how strongly each SKILLS_DATABASE category applies
+FIELD_CATEGORY_WEIGHTS = {
+    'technical': {'technical': 1.0, 'soft_skills': 0.6},
+    'business': {'business': 1.0, 'soft_skills': 0.6},
+    'creative': {'creative': 1.0, 'soft_skills': 0.6},
+}
+DEFAULT_CATEGORY_WEIGHTS = {'soft_skills': 1.0}
+# Whole words, with the compounds and inflections that matter ("Biotechnology", "Information Technologies",
+# "Multimedia"), but no keyword hidden inside another word ("art" in "Department", "media" in "Intermediate")
+FIELD_GROUP_PATTERN = re.compile(
+    r'\b(?:(?P<technical>computer\w*|softwares?|bcas?|\w*engineering|\w*technolog\w*)'
+    r'|(?P<business>\w*business\w*|managements?|\w*commerce|mbas?)'
+    r'|(?P<creative>design(?:s|er|ers|ing)?|arts?|creative\w*|\w*media))\b'
+)
+
+# Skills outside the catalog that are still worth suggesting, with a flat relevance score
+GENERAL_SKILLS = ['Microsoft Office', 'Communication', 'Problem Solving', 'Teamwork']
+EXPERIENCE_LEVEL_SKILLS = {
+    'Student': ['Academic Research', 'Team Projects', 'Time Management', 'Learning Agility'],
+    'Fresher': ['Quick Learning', 'Adaptability', 'Entry-Level Expertise', 'Professional Development'],
+}
+EXTRA_SKILL_SCORE = 0.45
+
+def skill_position_prior(position):
+    """Earlier entries of a SKILLS_DATABASE list are the more core skills"""
+    return 1.0 / (1 + position / 8)
+
+@functools.lru_cache(maxsize=1024)
+def match_field_groups(field):
+    return tuple(sorted({match.lastgroup for match in FIELD_GROUP_PATTERN.finditer(field.lower())})) if field else ()
+
+@functools.lru_cache(maxsize=256)
+def ranked_skill_candidates(field_groups, experience_level, category):
+    """All candidate skills for a field/experience combination, best first"""
+    weights = {}
+    for group in field_groups:
+        for name, weight in FIELD_CATEGORY_WEIGHTS[group].items():
+            weights[name] = max(weights.get(name, 0.0), weight)
+    weights = weights or DEFAULT_CATEGORY_WEIGHTS
+    if category:
+        weights = {category: weights.get(category) or 1.0}
+
+    scores = {}
+    names = {}
+    for name, weight in weights.items():
+        for position, skill in enumerate(SKILLS_DATABASE[name]):
+            key = canonical_skill(skill)[0]
+            names.setdefault(key, skill)
+            # Skills relevant to several weighted categories accumulate score
+            scores[key] = scores.get(key, 0.0) + weight * skill_position_prior(position)
+
+    if not category:
+        extras = (GENERAL_SKILLS if not field_groups else []) + EXPERIENCE_LEVEL_SKILLS.get(experience_level, [])
+        for skill in extras:
+            key, skill = canonical_skill(skill)
+            names.setdefault(key, skill)
+            scores[key] = max(scores.get(key, 0.0), EXTRA_SKILL_SCORE)
+
+    ranked = sorted(scores, key=lambda key: -scores[key])
+    return tuple((key, names[key]) for key in ranked)
+
+def get_recommended_skills(field, experience_level, current_skills=[], limit=20, category=None):
+    """Get intelligent skill recommendations based on field and experience, ranked by relevance"""
+    candidates = ranked_skill_candidates(
+        match_field_groups(field),
+        experience_level if experience_level in EXPERIENCE_LEVEL_SKILLS else '',
+        category
+    )
     
-    return list(dict.fromkeys(recommended))[:20]  # Return top 20 unique recommendations
+    # Set-based exclusion of skills the user already has, synonyms included
+    excluded = {canonical_skill(skill)[0] for skill in current_skills if isinstance(skill, str)}
+    recommended = []
+    for key, skill in candidates:
+        if len(recommended) >= limit:
+            break
+        if key not in excluded:
+            recommended.append(skill)
+    return recommended
+
+# ✅ SKILL AUTOCOMPLETE (sorted arrays searched with bisect)
+
+def build_skill_search_index():
+    """Sorted full-name keys plus sorted (token, key) pairs for word-prefix matches"""
+    names = sorted(SKILL_INDEX)
+    tokens = sorted({(token, key) for key in SKILL_INDEX for token in SKILL_TOKEN_PATTERN.findall(key)})
+    return names, tokens
+
+SKILL_SEARCH_NAMES, SKILL_SEARCH_TOKENS = build_skill_search_index()
+skill_search_cache = LRUCache(maxsize=4096)
+
+def search_skills(query, limit=10, category=None):
+    """Skills whose name, or any word of it, starts with `query`.
+
+    Full-name prefix matches rank before word-prefix matches ("scr" finds
+    "Scrum" before "Shell Scripting"); results are cached per prefix.
+    """
+    prefix = normalize_skill(query)
+    if not prefix:
+        return []
+    cache_key = (prefix, limit, category)
+    cached = skill_search_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    matches = []
+    seen = set()
+
+    def add(key):
+        if key in seen or len(matches) >= limit:
+            return
+        seen.add(key)
+        entry = SKILL_INDEX[key]
+        if category is None or category in entry["categories"]:
+            matches.append({"skill": entry["name"], "categories": entry["categories"]})
+
+    start = bisect.bisect_left(SKILL_SEARCH_NAMES, prefix)
+    for key in SKILL_SEARCH_NAMES[start:]:
+        if not key.startswith(prefix) or len(matches) >= limit:
+            break
+        add(key)
+
+    # Word-prefix matches: bisect on the first query word, then check the rest of the phrase
+    query_tokens = SKILL_TOKEN_PATTERN.findall(prefix)
+    if query_tokens and len(matches) < limit:
+        first = query_tokens[0]
+        phrase = ' '.join(query_tokens)
+        start = bisect.bisect_left(SKILL_SEARCH_TOKENS, (first, ''))
+        for token, key in SKILL_SEARCH_TOKENS[start:]:
+            if not token.startswith(first) or len(matches) >= limit:
+                break
+            if len(query_tokens) == 1 or phrase in ' '.join(SKILL_TOKEN_PATTERN.findall(key)):
+                add(key)
+
+    skill_search_cache.set(cache_key, matches)
+    return matches
 
 def generate_professional_title(user_prompt, specific_field, experience_level):
     """Generate appropriate professional title based on user data"""
-    prompt_lower = user_prompt.lower()
+    features = extract_prompt_features(user_prompt)
     
     # Education-based titles
-    if any(word in prompt_lower for word in ['bca', 'computer', 'software', 'programming']):
+    if features.get('title_tech'):
         if experience_level == 'Student':
             return "Computer Science Student"
         elif experience_level == 'Fresher':
@@ -215,13 +1673,13 @@ def generate_professional_title(user_prompt, specific_field, experience_level):
         else:
             return "Software Developer"
     
-    elif any(word in prompt_lower for word in ['engineering', 'engineer']):
+    elif features.get('title_engineering'):
         return "Engineering Student" if experience_level == 'Student' else "Engineer"
     
-    elif any(word in prompt_lower for word in ['business', 'management', 'mba']):
+    elif features.get('title_business'):
         return "Business Student" if experience_level == 'Student' else "Business Professional"
     
-    elif any(word in prompt_lower for word in ['design', 'creative', 'art']):
+    elif features.get('title_design'):
         return "Design Student" if experience_level == 'Student' else "Designer"
     
     # Field-specific titles
@@ -243,6 +1701,15 @@ def generate_professional_title(user_prompt, specific_field, experience_level):
     else:
         return "Professional"
 
+def default_summary(experience_level, stream):
+    """Generic summary from the form, for resumes written without one"""
+    summary = f"A dedicated {experience_level.lower() if experience_level else 'individual'} with strong educational background in {stream.lower() if stream else 'general studies'}. "
+    summary += "Excellent problem-solving abilities and quick learning capacity with passion for innovation. "
+    summary += "Strong foundation in technical principles and practical applications. "
+    summary += "Proven ability to adapt quickly and learn new technologies efficiently. "
+    summary += "Committed to continuous improvement and career growth in professional field."
+    return summary
+
 def validate_summary_length(summary):
     """Ensure summary is at least 50 words"""
     word_count = len(summary.split())
@@ -271,16 +1738,141 @@ def hello():
         "environment": os.environ.get('FLASK_ENV', 'development')
     })
 
+# One thread, so a hung database ties up at most one ping; later checks time out behind it
+health_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='health-db')
+
+def ping_database():
+    with app.app_context():
+        try:
+            db.session.execute(text('SELECT 1'))
+        finally:
+            db.session.remove()
+
+def check_database(timeout):
+    """(status, latency_ms) with status one of connected, timeout or error"""
+    started = time.perf_counter()
+    try:
+        health_executor.submit(ping_database).result(timeout=timeout)
+        status = 'connected'
+    except FutureTimeoutError:
+        status = 'timeout'
+    except Exception as e:
+        log_event("Database health check failed", level=logging.ERROR, error=str(e))
+        status = 'error'
+    return status, round((time.perf_counter() - started) * 1000, 1)
+
 @app.route("/api/health", methods=['GET'])
 def health_check():
+    database, latency_ms = check_database(app.config['HEALTH_DB_TIMEOUT'])
+    healthy = database == 'connected'
     return jsonify({
-        "status": "healthy",
-        "message": "API is working correctly",
+        "status": "healthy" if healthy else "degraded",
+        "message": "API is working correctly" if healthy else "Database is not responding",
         "timestamp": datetime.now().isoformat(),
-        "database": "connected",
-        "groq_configured": bool(os.environ.get("GROQ_API_KEY"))
+        "database": database,
+        "database_latency_ms": latency_ms,
+        "groq_configured": llm_client.configured,
+        "llm_circuit": llm_client.breaker.state
+    }), 200 if healthy else 503
+
+@app.route("/metrics", methods=['GET'])
+def get_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@metrics.collector
+def component_metrics():
+    cache = resume_cache.stats()
+    return [
+        ('resume_cache_requests_total', 'counter', 'Resume cache lookups by result (hit, miss or error).',
+         [((('result', 'hit'),), cache['hits']), ((('result', 'miss'),), cache['misses']), ((('result', 'error'),), cache['errors'])]),
+        ('llm_coalesced_requests_total', 'counter', 'LLM requests served by an identical call already in flight.',
+         [((), llm_client.single_flight.coalesced)]),
+        ('llm_circuit_open', 'gauge', '1 while the LLM circuit breaker is open or half-open.',
+         [((), int(llm_client.breaker.state != 'closed'))]),
+        ('log_records_dropped_total', 'counter', 'Log records dropped because the log queue was full.',
+         [((), log_handler.dropped)]),
+    ]
+
+@app.route("/api/stats", methods=['GET'])
+def get_stats():
+    return jsonify({
+        "resume_cache": resume_cache.stats(),
+        "llm": dict(llm_client.single_flight.stats(), circuit=llm_client.breaker.state),
+        "password_hashing": password_hasher.stats(),
+        "logging": {"queued": log_handler.queue.qsize(), "dropped": log_handler.dropped}
     })
 
+# ✅ PASSWORD HASHING (bounded worker pool)
+class PasswordHasherBusy(Exception):
+    """Too many password hashes are running or queued; the client should retry later"""
+
+class PasswordHasher:
+    """Runs bcrypt on a small dedicated pool so a login storm cannot occupy every request thread.
+
+    At most `max_pending` hashes may be running or queued at once; past that,
+    and when a hash waits longer than `timeout`, hash/verify raise
+    PasswordHasherBusy. With workers=0 hashing happens on the calling thread.
+    """
+
+    def __init__(self, workers, max_pending, timeout, rounds):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.rounds = rounds
+        self._pending = 0
+        self._rejected = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _release(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise PasswordHasherBusy()
+            self._pending += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordHasherBusy()
+
+    def hash(self, password):
+        return self._run(bcrypt.generate_password_hash, password, self.rounds).decode('utf-8')
+
+    def verify(self, password_hash, password):
+        return self._run(bcrypt.check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True when the hash was made with a different cost factor ($2b$<rounds>$...)"""
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return False
+
+    def stats(self):
+        return {"workers": self.workers, "pending": self._pending, "rejected": self._rejected}
+
+password_hasher = PasswordHasher(
+    app.config['PASSWORD_HASH_WORKERS'],
+    app.config['PASSWORD_HASH_MAX_PENDING'],
+    app.config['PASSWORD_HASH_TIMEOUT'],
+    app.config['BCRYPT_LOG_ROUNDS']
+)
+
+def password_hasher_busy_response():
+    response = jsonify({"message": "Server is busy, please retry shortly"})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
 @app.route("/api/signup", methods=['POST'])
 def signup():
     data = request.get_json()
@@ -289,13 +1881,17 @@ def signup():
     password = data.get('password')
     if not username or not email or not password:
         return jsonify({"message": "Missing username, email, or password"}), 400
-    hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+    try:
+        hashed_password = password_hasher.hash(password)
+    except PasswordHasherBusy:
+        return password_hasher_busy_response()
     new_user = User(username=username, email=email, password_hash=hashed_password)
     try:
         db.session.add(new_user)
         db.session.commit()
         return jsonify({"message": "User created successfully!"}), 201
-    except:
+    except IntegrityError:
+        db.session.rollback()
         return jsonify({"message": "Username or email already exists"}), 400
 
 @app.route("/api/login", methods=['POST'])
@@ -304,11 +1900,108 @@ def login():
     email = data.get('email')
     password = data.get('password')
     user = User.query.filter_by(email=email).first()
-    if user and bcrypt.check_password_hash(user.password_hash, password):
-        token = jwt.encode({'user_id': user.id, 'exp': datetime.utcnow() + timedelta(hours=24)}, app.config['SECRET_KEY'], algorithm="HS256")
-        return jsonify({"token": token})
+    try:
+        valid = bool(user) and password_hasher.verify(user.password_hash, password)
+    except PasswordHasherBusy:
+        return password_hasher_busy_response()
+    if valid:
+        if password_hasher.needs_rehash(user.password_hash):
+            # BCRYPT_LOG_ROUNDS changed since this hash was made; upgrade it while the password is at hand
+            try:
+                user.password_hash = password_hasher.hash(password)
+                db.session.commit()
+            except PasswordHasherBusy:
+                pass
+        return jsonify({"token": issue_token(user.id), "refresh_token": issue_token(user.id, 'refresh')})
     return jsonify({"message": "Invalid credentials"}), 401
 
+@app.route("/api/refresh-token", methods=['POST'])
+def refresh_token():
+    """New access token from a refresh token, without checking the password again"""
+    data = request.get_json(silent=True) or {}
+    claims = decode_token(data.get('refresh_token') or '', 'refresh')
+    if claims is None or get_auth_user(claims.get('user_id')) is None:
+        return jsonify({"message": "Invalid or expired refresh token"}), 401
+    return jsonify({"token": issue_token(claims['user_id'])})
+
+# ✅ AUTHENTICATION
+@dataclass(frozen=True, slots=True)
+class AuthUser:
+    """What protected endpoints need from a User row, safe to share across requests"""
+    id: int
+    username: str
+    email: str
+
+# Verified claims keyed by token hash, so repeated polls skip the HMAC check and the JSON decode
+auth_claims_cache = LRUCache(app.config['AUTH_CLAIMS_CACHE_SIZE'], ttl=app.config['AUTH_CLAIMS_CACHE_TTL'])
+auth_user_cache = LRUCache(app.config['AUTH_USER_CACHE_SIZE'], ttl=app.config['AUTH_USER_CACHE_TTL'])
+
+def issue_token(user_id, token_type='access'):
+    # PyJWT pulls in cryptography; importing it here keeps it off the cold-start path
+    import jwt
+    ttl = app.config['REFRESH_TOKEN_TTL'] if token_type == 'refresh' else app.config['ACCESS_TOKEN_TTL']
+    return jwt.encode({
+        'user_id': user_id,
+        'type': token_type,
+        'exp': datetime.now(timezone.utc) + timedelta(seconds=ttl)
+    }, app.config['SECRET_KEY'], algorithm="HS256")
+
+def decode_token(token, token_type='access'):
+    """Verified claims of a token of the given type, or None"""
+    if not token:
+        return None
+    key = hashlib.sha256(token.encode('utf-8')).hexdigest()
+    claims = auth_claims_cache.get(key)
+    if claims is None:
+        import jwt
+        try:
+            claims = jwt.decode(token, app.config['SECRET_KEY'], algorithms=["HS256"])
+        except jwt.InvalidTokenError:
+            return None
+        # Never cache a token past its own expiry
+        ttl = app.config['AUTH_CLAIMS_CACHE_TTL']
+        if 'exp' in claims:
+            ttl = min(ttl, claims['exp'] - time.time())
+        if ttl > 0:
+            auth_claims_cache.set(key, claims, ttl=ttl)
+    # Tokens issued before refresh tokens existed carry no type and are access tokens
+    if claims.get('type', 'access') != token_type:
+        return None
+    return claims
+
+def get_auth_user(user_id):
+    """AuthUser for an id, from the cache or one primary-key lookup; None if the user does not exist"""
+    if user_id is None:
+        return None
+    user = auth_user_cache.get(user_id)
+    if user is None:
+        row = db.session.get(User, user_id)
+        if row is None:
+            return None
+        user = AuthUser(row.id, row.username, row.email)
+        auth_user_cache.set(user_id, user)
+    return user
+
+def current_auth_user():
+    """The request's authenticated AuthUser or None, resolved at most once per request"""
+    if 'auth_user' not in g:
+        g.auth_user = None
+        auth_header = request.headers.get('Authorization', '')
+        if auth_header.startswith('Bearer '):
+            claims = decode_token(auth_header[len('Bearer '):])
+            if claims is not None:
+                g.auth_user = get_auth_user(claims.get('user_id'))
+    return g.auth_user
+
+def require_auth(view):
+    """Reject requests without a valid Bearer access token; the user is available as g.auth_user"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if current_auth_user() is None:
+            return jsonify({"error": "Authentication required"}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
 # ✅ NEW ENDPOINT: Get skill recommendations
 @app.route("/api/skill-recommendations", methods=['POST'])
 def get_skill_recommendations():
@@ -317,8 +2010,16 @@ def get_skill_recommendations():
         field = data.get('field', '')
         experience_level = data.get('experienceLevel', '')
         current_skills = data.get('currentSkills', [])
+        category = data.get('category') or None
+        
+        if category is not None and category not in SKILLS_DATABASE:
+            return jsonify({"error": f"category must be one of: {', '.join(SKILLS_DATABASE)}"}), 400
+        try:
+            limit = max(1, min(int(data.get('limit', 20)), 100))
+        except (TypeError, ValueError):
+            return jsonify({"error": "limit must be a number"}), 400
         
-        recommendations = get_recommended_skills(field, experience_level, current_skills)
+        recommendations = get_recommended_skills(field, experience_level, current_skills, limit=limit, category=category)
         
         return jsonify({
             "recommendedSkills": recommendations,
@@ -326,37 +2027,34 @@ def get_skill_recommendations():
         })
         
     except Exception as e:
-        print("❌ Error getting skill recommendations:", str(e))
+        log_event("Error getting skill recommendations", level=logging.ERROR, error=str(e))
         return jsonify({"recommendedSkills": [], "totalAvailable": 0})
 
-# ✅ SKILL VERIFICATION ENDPOINTS
-@app.route("/api/generate-skill-question", methods=['POST'])
-def generate_skill_question():
-    try:
-        data = request.get_json()
-        skill = data.get('skill')
-        level = data.get('level', 'basic')
-        field = data.get('field', '')
-        difficulty = data.get('difficulty', 'basic')  # basic, intermediate, advanced based on attempt
-        
-        if not skill:
-            return jsonify({"error": "Skill is required"}), 400
+@app.route("/api/skills/search", methods=['GET'])
+def search_skills_endpoint():
+    query = request.args.get('q', '')
+    category = request.args.get('category') or None
+    if category is not None and category not in SKILLS_DATABASE:
+        return jsonify({"error": f"category must be one of: {', '.join(SKILLS_DATABASE)}"}), 400
+    limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+    
+    response = jsonify({"query": query, "results": search_skills(query, limit, category)})
+    # The catalog only changes with a deploy, so browsers may reuse answers
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
 
-        # Generate question using AI
-        api_key = os.environ.get("GROQ_API_KEY")
-        if not api_key:
-            return jsonify({"error": "GROQ_API_KEY not set"}), 500
+# ✅ SKILL QUESTION BANK
+QUESTION_DIFFICULTY_FOCUS = {
+    'basic': 'fundamental concepts and basic knowledge',
+    'intermediate': 'practical applications and intermediate concepts', 
+    'advanced': 'complex scenarios and expert-level understanding'
+}
 
-        # Difficulty mapping
-        difficulty_map = {
-            'basic': 'fundamental concepts and basic knowledge',
-            'intermediate': 'practical applications and intermediate concepts', 
-            'advanced': 'complex scenarios and expert-level understanding'
-        }
-        
-        prompt = f"""
+def build_skill_question_prompt(skill, level, field, difficulty):
+    """Build the LLM prompt for a single multiple-choice question"""
+    return f"""
 Generate a multiple-choice question to test {skill} knowledge at {level} level.
-Focus on: {difficulty_map.get(difficulty, 'fundamental concepts')}
+Focus on: {QUESTION_DIFFICULTY_FOCUS.get(difficulty, 'fundamental concepts')}
 
 Skill: {skill}
 Level: {level}
@@ -383,36 +2081,349 @@ Format your response as JSON:
     "explanation": "Brief explanation why this is correct"
 }}
 
-Make the question challenging but fair for the specified level.
-"""
+Make the question challenging but fair for the specified level.
+"""
+
+def is_valid_question_data(question_data):
+    """Check that an AI generated question has a question, A-D options and a valid answer"""
+    if not isinstance(question_data, dict) or not question_data.get('question'):
+        return False
+    options = question_data.get('options')
+    if not isinstance(options, dict) or sorted(options) != ['A', 'B', 'C', 'D']:
+        return False
+    return str(question_data.get('correct_answer', '')).strip().upper() in options
+
+def generate_question_with_ai(skill, level, field, difficulty, client=None):
+    """Ask the LLM for a new question, returns None if the output is unusable"""
+    chat_completion = (client or llm_client).create(
+        messages=[{"role": "user", "content": build_skill_question_prompt(skill, level, field, difficulty)}],
+        model=LLM_MODEL,
+        temperature=0.7,
+        max_tokens=500
+    )
+    ai_content = chat_completion.choices[0].message.content.strip()
+    question_data = extract_json_from_text(ai_content)
+    if not is_valid_question_data(question_data):
+        return None
+    return question_data
+
+def create_fallback_question(skill, field):
+    """Generic question used when the pool is empty and the LLM is unavailable"""
+    return {
+        "question": f"What is the primary purpose of {skill} in {field or 'software development'}?",
+        "options": {
+            "A": "To solve complex problems efficiently",
+            "B": "To manage database operations", 
+            "C": "To create user interfaces",
+            "D": "To handle network security"
+        },
+        "correct_answer": "A",
+        "explanation": f"{skill} is primarily used to solve problems efficiently in its domain."
+    }
+
+def build_skill_question(skill, level, difficulty, question_data):
+    """Unsaved SkillQuestion for question_data"""
+    return SkillQuestion(
+        skill=skill,
+        level=level,
+        difficulty=difficulty,
+        question=question_data['question'],
+        options=question_data['options'],
+        correct_answer=str(question_data['correct_answer']).strip().upper(),
+        explanation=question_data.get('explanation', '')
+    )
+
+def store_skill_question(skill, level, difficulty, question_data):
+    """Persist a question into its (skill, level, difficulty) pool; a question already in the pool is returned as is"""
+    existing = pooled_question(skill, level, difficulty, question_data['question'])
+    if existing is not None:
+        return existing
+    question = build_skill_question(skill, level, difficulty, question_data)
+    db.session.add(question)
+    db.session.commit()
+    return question
+
+def skill_question_pool(skill, level, difficulty):
+    """Indexed query over one question pool"""
+    return SkillQuestion.query.filter_by(skill=skill, level=level, difficulty=difficulty)
+
+def pooled_question(skill, level, difficulty, text):
+    """The pool's question with exactly this text, if any"""
+    return skill_question_pool(skill, level, difficulty).filter_by(question=text).first()
+
+def serialize_skill_question(question, include_answer=False):
+    """Question payload for clients; answers stay server-side unless asked for"""
+    question_data = {
+        "id": question.id,
+        "question": question.question,
+        "options": question.options
+    }
+    if include_answer:
+        question_data.update({
+            "skill": question.skill,
+            "level": question.level,
+            "difficulty": question.difficulty,
+            "correct_answer": question.correct_answer,
+            "explanation": question.explanation or ''
+        })
+    return question_data
+
+# Stored questions never change, so cached entries need no invalidation
+question_cache = LRUCache(maxsize=app.config['SKILL_QUESTION_CACHE_SIZE'])
+
+def get_questions_by_id(question_ids):
+    """Resolve question ids through the LRU cache, loading all misses with one IN query"""
+    found = {}
+    missing = []
+    for question_id in question_ids:
+        cached = question_cache.get(question_id)
+        if cached is None:
+            missing.append(question_id)
+        else:
+            found[question_id] = cached
+    if missing:
+        for question in SkillQuestion.query.filter(SkillQuestion.id.in_(missing)):
+            question_data = serialize_skill_question(question, include_answer=True)
+            question_cache.set(question.id, question_data)
+            found[question.id] = question_data
+    return found
+
+def grade_skill_answer(question_data, user_answer):
+    return {
+        "question_id": question_data['id'],
+        "is_correct": str(user_answer).strip().upper() == question_data['correct_answer'],
+        "correct_answer": question_data['correct_answer'],
+        "explanation": question_data['explanation'],
+        "user_answer": user_answer,
+        "skill": question_data['skill'],
+        "level": question_data['level']
+    }
+
+# ✅ QUESTION POOL WARMER
+QUESTION_DIFFICULTIES = ['basic', 'intermediate', 'advanced']
+# Skill levels a question can target; like difficulties, every value is its own pool
+QUESTION_LEVELS = ['basic', 'intermediate', 'advanced']
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls to at most `rate_per_second`"""
+
+    def __init__(self, rate_per_second):
+        self.interval = 1.0 / rate_per_second if rate_per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def iter_catalog_skills(categories=None):
+    """Unique skills from SKILLS_DATABASE, optionally limited to some categories"""
+    names = categories or list(SKILLS_DATABASE)
+    return list(dict.fromkeys(skill for name in names for skill in SKILLS_DATABASE.get(name, [])))
+
+def warm_question_pool(target_size, level='basic', max_workers=4, rate_per_second=2.0, categories=None, client=None, progress=None):
+    """Fill every catalog question pool up to target_size.
+
+    Pool sizes are read from the database first, so an interrupted run resumes
+    where it stopped. `client` can be any object with the Groq
+    chat.completions.create interface, e.g. a local stub. Progress lines go
+    to `progress(message)`, the application log by default.
+    """
+    progress = progress or log_event
+    client = LLMClient(client=client) if client is not None else llm_client
+    limiter = RateLimiter(rate_per_second)
+
+    counts = dict(
+        ((skill, difficulty), count)
+        for skill, difficulty, count in db.session.query(
+            SkillQuestion.skill, SkillQuestion.difficulty, func.count(SkillQuestion.id)
+        ).filter(SkillQuestion.level == level).group_by(SkillQuestion.skill, SkillQuestion.difficulty)
+    )
+    buckets = [(skill, difficulty) for skill in iter_catalog_skills(categories) for difficulty in QUESTION_DIFFICULTIES]
+    jobs = [bucket for bucket in buckets for _ in range(max(0, target_size - counts.get(bucket, 0)))]
+    stats = {"buckets": len(buckets), "requested": len(jobs), "stored": 0, "duplicates": 0, "failed": 0}
+    progress(f"🔥 Warming {len(buckets)} question pools: {len(jobs)} questions to generate")
+
+    def generate(skill, difficulty):
+        limiter.wait()
+        return generate_question_with_ai(skill, level, '', difficulty, client=client)
+
+    remaining = iter(jobs)
+    in_flight = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            # Keep at most max_workers requests in flight
+            while len(in_flight) < max_workers:
+                job = next(remaining, None)
+                if job is None:
+                    break
+                in_flight[executor.submit(generate, *job)] = job
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                skill, difficulty = in_flight.pop(future)
+                try:
+                    question_data = future.result()
+                except Exception as e:
+                    log_event("Error generating question", level=logging.ERROR, skill=skill, difficulty=difficulty, error=str(e))
+                    question_data = None
+
+                if not question_data:
+                    stats["failed"] += 1
+                elif pooled_question(skill, level, difficulty, question_data['question']) is not None:
+                    # A repeat adds nothing to the pool; the next run fills the gap
+                    stats["duplicates"] += 1
+                else:
+                    # Stored one by one so an interrupted run keeps its progress
+                    store_skill_question(skill, level, difficulty, question_data)
+                    stats["stored"] += 1
+
+                completed = stats["stored"] + stats["duplicates"] + stats["failed"]
+                if completed % 25 == 0 or completed == len(jobs):
+                    progress(f"   {completed}/{len(jobs)} done ({stats['stored']} stored, "
+                             f"{stats['duplicates']} duplicates, {stats['failed']} failed)")
+
+    return stats
+
+@app.cli.command('warm-question-pool')
+@click.option('--target', default=None, type=int, help='Questions per pool (defaults to SKILL_QUESTION_POOL_SIZE).')
+@click.option('--level', default='basic', show_default=True, type=click.Choice(QUESTION_LEVELS))
+@click.option('--workers', default=4, show_default=True, help='Maximum LLM requests in flight.')
+@click.option('--rate', default=2.0, show_default=True, help='Maximum LLM requests per second.')
+@click.option('--category', 'categories', multiple=True, type=click.Choice(list(SKILLS_DATABASE)), help='Limit to one or more SKILLS_DATABASE categories.')
+def warm_question_pool_command(target, level, workers, rate, categories):
+    """Pre-generate skill questions for the whole SKILLS_DATABASE catalog."""
+    if not llm_client.configured:
+        raise click.ClickException("GROQ_API_KEY not set")
+    if app.config['DB_AUTO_CREATE']:
+        table_initializer.ensure()
+    stats = warm_question_pool(
+        target or app.config['SKILL_QUESTION_POOL_SIZE'],
+        level=level,
+        max_workers=workers,
+        rate_per_second=rate,
+        categories=list(categories) or None,
+        progress=click.echo
+    )
+    click.echo(f"✅ Question pools warmed: {stats}")
+
+class QuestionPoolRefiller:
+    """Tops up question pools in the background, one LLM call per pool at a time.
+
+    Requests are served from the pool as soon as it has any question, so
+    the LLM latency is only paid synchronously for an empty pool.
+    """
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self._executor = None
+        self._refilling = set()
+        self._lock = threading.Lock()
+
+    def submit(self, skill, level, field, difficulty):
+        if not self.max_workers:
+            return False
+        bucket = (skill, level, difficulty)
+        with self._lock:
+            if bucket in self._refilling:
+                return False
+            self._refilling.add(bucket)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='question-refill')
+        self._executor.submit(self._run, skill, level, field, difficulty)
+        return True
+
+    def _run(self, skill, level, field, difficulty):
+        try:
+            question_data = generate_question_with_ai(skill, level, field, difficulty)
+            if question_data:
+                with app.app_context():
+                    store_skill_question(skill, level, difficulty, question_data)
+        except Exception as e:
+            log_event("Error refilling question pool", level=logging.ERROR, skill=skill, difficulty=difficulty, error=str(e))
+        finally:
+            with self._lock:
+                self._refilling.discard((skill, level, difficulty))
+
+question_pool_refiller = QuestionPoolRefiller(app.config['SKILL_QUESTION_REFILL_WORKERS'])
+empty_pool_flight = SingleFlight()
+
+def fill_empty_question_pool(skill, level, field, difficulty):
+    """Generate and store the first question of a pool; returns its id, or None if the LLM output was unusable"""
+    question_data = generate_question_with_ai(skill, level, field, difficulty)
+    if not question_data:
+        return None
+    return store_skill_question(skill, level, difficulty, question_data).id
+
+# ✅ SKILL VERIFICATION ENDPOINTS
+@app.route("/api/generate-skill-question", methods=['POST'])
+def generate_skill_question():
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"error": "No JSON data received"}), 400
+        skill = data.get('skill')
+        level = data.get('level', 'basic')
+        field = data.get('field', '')
+        difficulty = data.get('difficulty', 'basic')  # basic, intermediate, advanced based on attempt
+        
+        if not isinstance(skill, str) or not skill.strip():
+            return jsonify({"error": "Skill is required"}), 400
+        skill = skill.strip()
+        if len(skill) > SkillQuestion.skill.type.length:
+            return jsonify({"error": f"skill must be at most {SkillQuestion.skill.type.length} characters"}), 400
+        # Every distinct value is a separate pool that costs LLM calls to fill, so only known values are accepted
+        if level not in QUESTION_LEVELS:
+            return jsonify({"error": f"level must be one of: {', '.join(QUESTION_LEVELS)}"}), 400
+        if difficulty not in QUESTION_DIFFICULTIES:
+            return jsonify({"error": f"difficulty must be one of: {', '.join(QUESTION_DIFFICULTIES)}"}), 400
+        if not isinstance(field, str):
+            field = ''
+
+        pool = skill_question_pool(skill, level, difficulty)
+        pool_size = pool.count()
+        if not pool_size and not llm_client.configured:
+            return jsonify({"error": "GROQ_API_KEY not set"}), 500
+
+        # Below its target size the pool is topped up in the background; only an empty pool waits for the LLM
+        question = None
+        if llm_client.configured and pool_size < app.config['SKILL_QUESTION_POOL_SIZE']:
+            if pool_size:
+                question_pool_refiller.submit(skill, level, field, difficulty)
+            else:
+                release_db_connection()
+                try:
+                    # Concurrent requests for the same empty pool share one LLM call and one stored question
+                    question_id = empty_pool_flight.do(
+                        (skill, level, difficulty), lambda: fill_empty_question_pool(skill, level, field, difficulty)
+                    )
+                    if question_id is not None:
+                        question = db.session.get(SkillQuestion, question_id)
+                except Exception as e:
+                    db.session.rollback()
+                    log_event("Error refilling question pool", level=logging.ERROR, error=str(e))
 
-        client = Groq(api_key=api_key)
-        chat_completion = client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model="llama-3.1-8b-instant",
-            temperature=0.7,
-            max_tokens=500
-        )
-        
-        ai_content = chat_completion.choices[0].message.content.strip()
-        question_data = extract_json_from_text(ai_content)
-        
-        if not question_data:
-            # Fallback question
-            question_data = {
-                "question": f"What is the primary purpose of {skill} in {field or 'software development'}?",
-                "options": {
-                    "A": "To solve complex problems efficiently",
-                    "B": "To manage database operations", 
-                    "C": "To create user interfaces",
-                    "D": "To handle network security"
-                },
-                "correct_answer": "A",
-                "explanation": f"{skill} is primarily used to solve problems efficiently in its domain."
-            }
+        if question is None and pool_size:
+            question = pool.offset(random.randrange(pool_size)).first()
+
+        if question is None:
+            # The generic fallback never enters the pool; it carries its own answer since it has no id to verify against
+            question = build_skill_question(skill, level, difficulty, create_fallback_question(skill, field))
+            question_data = dict(serialize_skill_question(question, include_answer=True), fallback=True)
+        else:
+            question_data = serialize_skill_question(question)
         
         return jsonify({
             "question": question_data,
+            "question_id": question.id,
             "skill": skill,
             "level": level,
             "difficulty": difficulty,
@@ -420,50 +2431,273 @@ Make the question challenging but fair for the specified level.
         })
         
     except Exception as e:
-        print("❌ Error generating skill question:", str(e))
+        log_event("Error generating skill question", level=logging.ERROR, error=str(e))
         return jsonify({"error": "Failed to generate question"}), 500
 
+MAX_ANSWERS_PER_BATCH = 100
+
+def parse_question_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
 @app.route("/api/verify-skill-answer", methods=['POST'])
 def verify_skill_answer():
     try:
         data = request.get_json()
-        question_id = data.get('question_id')
-        user_answer = data.get('user_answer')
-        skill = data.get('skill')
-        level = data.get('level')
         
-        # For now, we'll use the question data from the request
-        # In a full implementation, you'd fetch from database
-        question_data = data.get('question_data')
+        # Batch form: {"answers": [{"question_id": 1, "user_answer": "A"}, ...]}
+        if 'answers' in data:
+            answers = data.get('answers') or []
+            if (not isinstance(answers, list) or len(answers) > MAX_ANSWERS_PER_BATCH
+                    or not all(isinstance(answer, dict) for answer in answers)):
+                return jsonify({"error": f"answers must be a list of at most {MAX_ANSWERS_PER_BATCH} objects"}), 400
+            
+            question_ids = [parse_question_id(answer.get('question_id')) for answer in answers]
+            questions = get_questions_by_id([qid for qid in question_ids if qid is not None])
+            
+            results = []
+            for question_id, answer in zip(question_ids, answers):
+                user_answer = answer.get('user_answer')
+                if question_id not in questions or not user_answer:
+                    results.append({"question_id": answer.get('question_id'), "error": "Unknown question or missing answer"})
+                else:
+                    results.append(grade_skill_answer(questions[question_id], user_answer))
+            
+            correct = sum(1 for result in results if result.get('is_correct'))
+            return jsonify({
+                "results": results,
+                "correct": correct,
+                "total": len(results),
+                "score": round(100 * correct / len(results)) if results else 0
+            })
+        
+        question_id = parse_question_id(data.get('question_id'))
+        user_answer = data.get('user_answer')
         
-        if not question_data or not user_answer:
+        if question_id is None or not user_answer:
             return jsonify({"error": "Missing data"}), 400
         
-        is_correct = (user_answer.upper() == question_data['correct_answer'].upper())
+        question_data = get_questions_by_id([question_id]).get(question_id)
+        if not question_data:
+            return jsonify({"error": "Question not found"}), 404
         
-        return jsonify({
-            "is_correct": is_correct,
-            "correct_answer": question_data['correct_answer'],
-            "explanation": question_data.get('explanation', ''),
-            "user_answer": user_answer,
-            "skill": skill
-        })
+        return jsonify(grade_skill_answer(question_data, user_answer))
         
     except Exception as e:
-        print("❌ Error verifying answer:", str(e))
+        log_event("Error verifying answer", level=logging.ERROR, error=str(e))
         return jsonify({"error": "Failed to verify answer"}), 500
 
+def upsert_skill_attempts(batch):
+    """Apply coalesced attempts {(user_id, skill, level): entry} in a single transaction"""
+    table = SkillVerification.__table__
+    rows = [{
+        "user_id": user_id,
+        "skill": skill,
+        "level": level,
+        "attempts": entry["attempts"],
+        "last_attempt": entry["last_attempt"],
+        "is_verified": entry["verified_at"] is not None,
+        "verified_at": entry["verified_at"],
+        "created_at": datetime.utcnow()
+    } for (user_id, skill, level), entry in batch.items()]
+
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        insert = None
+
+    if insert is None:
+        # Generic path for backends without INSERT .. ON CONFLICT
+        for row in rows:
+            record = SkillVerification.query.filter_by(user_id=row["user_id"], skill=row["skill"], level=row["level"]).first()
+            if record is None:
+                db.session.add(SkillVerification(**row))
+                continue
+            record.attempts = (record.attempts or 0) + row["attempts"]
+            record.last_attempt = row["last_attempt"]
+            if row["is_verified"] and not record.is_verified:
+                record.is_verified = True
+                record.verified_at = row["verified_at"]
+    else:
+        for i in range(0, len(rows), 200):
+            stmt = insert(table).values(rows[i:i + 200])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['user_id', 'skill', 'level'],
+                set_={
+                    "attempts": func.coalesce(table.c.attempts, 0) + stmt.excluded.attempts,
+                    "last_attempt": stmt.excluded.last_attempt,
+                    "is_verified": or_(table.c.is_verified, stmt.excluded.is_verified),
+                    "verified_at": func.coalesce(table.c.verified_at, stmt.excluded.verified_at)
+                }
+            )
+            db.session.execute(stmt)
+    db.session.commit()
+
+class AttemptBuffer:
+    """Write-behind buffer that coalesces skill attempts into bulk upserts.
+
+    Attempts are merged per (user_id, skill, level) in memory and written by a
+    background thread every `flush_interval` seconds, or sooner once
+    `max_pending` rows are waiting. A batch that fails `max_failures` flushes
+    in a row is dead-lettered to the log instead of being retried forever.
+    """
+
+    def __init__(self, flush_interval, max_pending, max_failures=5):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_failures = max_failures
+        self.failures = 0
+        self.dropped = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def add(self, user_id, skill, level, passed, attempted_at):
+        with self._lock:
+            self._merge((user_id, skill, level), {
+                "attempts": 1,
+                "last_attempt": attempted_at,
+                "verified_at": attempted_at if passed else None
+            })
+            pending = len(self._pending)
+            if self._thread is None:
+                # Started lazily so importing the app never spawns threads
+                self._thread = threading.Thread(target=self._run, name='attempt-buffer', daemon=True)
+                self._thread.start()
+        if pending >= self.max_pending:
+            self._wakeup.set()
+
+    def _merge(self, key, entry):
+        current = self._pending.get(key)
+        if current is None:
+            self._pending[key] = dict(entry)
+            return
+        current["attempts"] += entry["attempts"]
+        current["last_attempt"] = max(current["last_attempt"], entry["last_attempt"])
+        if current["verified_at"] is None:
+            current["verified_at"] = entry["verified_at"]
+
+    def pending_for(self, user_id):
+        """Buffered, not yet written attempts of one user"""
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._pending.items() if key[0] == user_id}
+
+    def flush(self):
+        """Write all pending attempts; must run inside an app context"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            try:
+                upsert_skill_attempts(batch)
+            except OperationalError:
+                # Transient (locked database, lost connection): keep the attempts for the next flush
+                db.session.rollback()
+                self.failures += 1
+                if self.failures >= self.max_failures:
+                    self.failures = 0
+                    self._dead_letter(batch, f"{self.max_failures} failed flushes in a row")
+                else:
+                    self._requeue(batch.items())
+                raise
+            except Exception:
+                # One row the database rejects fails the whole statement; retry row by row so only that row is dropped
+                db.session.rollback()
+                written = self._flush_rows(batch)
+            else:
+                written = len(batch)
+            self.failures = 0
+            return written
+
+    def _flush_rows(self, batch):
+        written = 0
+        rows = iter(batch.items())
+        for key, entry in rows:
+            try:
+                upsert_skill_attempts({key: entry})
+            except OperationalError:
+                db.session.rollback()
+                self._requeue([(key, entry), *rows])
+                raise
+            except Exception as e:
+                db.session.rollback()
+                self._dead_letter({key: entry}, str(e))
+            else:
+                written += 1
+        return written
+
+    def _requeue(self, items):
+        with self._lock:
+            for key, entry in items:
+                self._merge(key, entry)
+
+    def _dead_letter(self, batch, reason):
+        """Give up on attempts: log every one so it can be replayed by hand"""
+        self.dropped += len(batch)
+        metrics.inc('skill_attempts_dropped_total', amount=len(batch))
+        log_event("Dropped skill attempts", level=logging.ERROR, reason=reason, count=len(batch), attempts=[{
+            "user_id": user_id,
+            "skill": skill,
+            "level": level,
+            "attempts": entry["attempts"],
+            "last_attempt": entry["last_attempt"].isoformat(),
+            "verified_at": entry["verified_at"] and entry["verified_at"].isoformat()
+        } for (user_id, skill, level), entry in batch.items()])
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            with app.app_context():
+                try:
+                    self.flush()
+                except Exception as e:
+                    log_event("Error flushing skill attempts", level=logging.ERROR, error=str(e))
+
+attempt_buffer = AttemptBuffer(
+    app.config['SKILL_ATTEMPT_FLUSH_INTERVAL'],
+    app.config['SKILL_ATTEMPT_FLUSH_SIZE'],
+    app.config['SKILL_ATTEMPT_MAX_FLUSH_FAILURES']
+)
+
+@atexit.register
+def flush_attempt_buffer():
+    with app.app_context():
+        try:
+            attempt_buffer.flush()
+        except Exception as e:
+            log_event("Error flushing skill attempts on shutdown", level=logging.ERROR, error=str(e))
+
 @app.route("/api/track-skill-attempt", methods=['POST'])
+@require_auth
 def track_skill_attempt():
     try:
-        data = request.get_json()
-        user_id = data.get('user_id')  # In real app, get from JWT
+        user_id = g.auth_user.id
+        
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"error": "No JSON data received"}), 400
         skill = data.get('skill')
         level = data.get('level')
-        passed = data.get('passed', False)
+        passed = bool(data.get('passed', False))
         
-        # For demo, we'll just return success
-        # In full implementation, you'd update database
+        if not isinstance(skill, str) or not isinstance(level, str) or not skill.strip() or not level.strip():
+            return jsonify({"error": "Skill and level are required strings"}), 400
+        # Checked here so one oversized value cannot fail a whole bulk upsert later
+        if len(skill) > SkillVerification.skill.type.length or len(level) > SkillVerification.level.type.length:
+            return jsonify({"error": f"skill must be at most {SkillVerification.skill.type.length} and level at most "
+                                     f"{SkillVerification.level.type.length} characters"}), 400
+        
+        # Buffered; written to SkillVerification by the next bulk flush
+        attempt_buffer.add(user_id, skill, level, passed, datetime.utcnow())
         
         return jsonify({
             "success": True,
@@ -474,67 +2708,90 @@ def track_skill_attempt():
         })
         
     except Exception as e:
-        print("❌ Error tracking attempt:", str(e))
+        log_event("Error tracking attempt", level=logging.ERROR, error=str(e))
         return jsonify({"error": "Failed to track attempt"}), 500
 
-@app.route("/api/get-skill-verification-status", methods=['POST'])
-def get_skill_verification_status():
-    try:
-        data = request.get_json()
-        user_id = data.get('user_id')
-        skills = data.get('skills', [])
-        
-        # For demo, return mock status
-        # In full implementation, query database
-        status = {}
-        for skill in skills:
-            status[skill] = {
-                "verified": False,
-                "attempts": 0,
-                "last_attempt": None,
-                "can_retry": True
+def build_verification_status(user_id, skills):
+    """Per-skill verification status from one IN-list query plus still-buffered attempts"""
+    levels = {skill: {} for skill in skills}
+    # Served by the (user_id, skill, level) unique index: user_id, skill is its leading prefix
+    rows = db.session.query(
+        SkillVerification.skill,
+        SkillVerification.level,
+        SkillVerification.attempts,
+        SkillVerification.last_attempt,
+        SkillVerification.is_verified
+    ).filter(
+        SkillVerification.user_id == user_id,
+        SkillVerification.skill.in_(levels)
+    )
+    for skill, level, attempts, last_attempt, is_verified in rows:
+        levels[skill][level] = {"attempts": attempts or 0, "last_attempt": last_attempt, "verified": bool(is_verified)}
+
+    # Read-your-writes for attempts that have not been flushed yet
+    for (_, skill, level), entry in attempt_buffer.pending_for(user_id).items():
+        if skill not in levels:
+            continue
+        current = levels[skill].setdefault(level, {"attempts": 0, "last_attempt": None, "verified": False})
+        current["attempts"] += entry["attempts"]
+        current["last_attempt"] = max(filter(None, [current["last_attempt"], entry["last_attempt"]]))
+        current["verified"] = current["verified"] or entry["verified_at"] is not None
+
+    status = {}
+    for skill, by_level in levels.items():
+        last_attempts = [entry["last_attempt"] for entry in by_level.values() if entry["last_attempt"]]
+        status[skill] = {
+            "verified": any(entry["verified"] for entry in by_level.values()),
+            "attempts": sum(entry["attempts"] for entry in by_level.values()),
+            "last_attempt": max(last_attempts).isoformat() if last_attempts else None,
+            "can_retry": True,
+            "levels": {
+                level: {
+                    "verified": entry["verified"],
+                    "attempts": entry["attempts"],
+                    "last_attempt": entry["last_attempt"].isoformat() if entry["last_attempt"] else None
+                } for level, entry in by_level.items()
             }
-        
-        return jsonify({"verification_status": status})
-        
-    except Exception as e:
-        print("❌ Error getting verification status:", str(e))
-        return jsonify({"error": "Failed to get status"}), 500
+        }
+    return status
 
-@app.route("/api/generate-resume-from-prompt", methods=['POST'])
-def generate_resume():
+@app.route("/api/get-skill-verification-status", methods=['GET', 'POST'])
+@require_auth
+def get_skill_verification_status():
     try:
-        data = request.get_json()
-        print("📨 RECEIVED DATA FROM FRONTEND:", data)
+        user_id = g.auth_user.id
         
-        if not data:
-            return jsonify({"error": "No JSON data received"}), 400
-            
-        user_prompt = data.get('prompt', '')
-        full_name = data.get('fullName', '')
-        email = data.get('email', '')
-        phone = data.get('phone', '')
-        location = data.get('location', '')
-        stream = data.get('stream', '')
-        specific_field = data.get('field', '')  # Changed from specificField to field
-        user_type = data.get('userType', '')
-        experience_level = data.get('experienceLevel', '')
-        target_role = data.get('targetRole', '')
-        skills_input = data.get('skills', '')
+        if request.method == 'GET':
+            skills = [skill for value in request.args.getlist('skills') for skill in value.split(',') if skill]
+        else:
+            data = request.get_json(silent=True)
+            if not isinstance(data, dict):
+                return jsonify({"error": "No JSON data received"}), 400
+            skills = data.get('skills', [])
+            if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+                return jsonify({"error": "skills must be a list of strings"}), 400
         
-        # ✅ USE BASIC INFO FROM FORM, NOT FROM PROMPT EXTRACTION
-        print(f"🔍 Using basic info - Name: {full_name}, Email: {email}, Phone: {phone}, Location: {location}")
+        response = jsonify({"verification_status": build_verification_status(user_id, list(dict.fromkeys(skills)))})
         
-        content_type = detect_content_type(user_prompt)
-        print(f"🔍 Detected content type: {content_type}")
+        # Dashboards poll this endpoint; unchanged status costs a 304 instead of a body
+        response.add_etag(weak=True)
+        etag, _ = response.get_etag()
+        if request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag, weak=True)
+        return response
         
-        api_key = os.environ.get("GROQ_API_KEY")
-
-        if not api_key:
-            return jsonify({"error": "GROQ_API_KEY environment variable is not set"}), 500
+    except Exception as e:
+        log_event("Error getting verification status", level=logging.ERROR, error=str(e))
+        return jsonify({"error": "Failed to get status"}), 500
 
-        # ✅ ENHANCED PROMPT WITH NEW SECTIONS
-        enhanced_prompt = f"""
+def build_resume_prompt(data):
+    """Full-resume LLM prompt from the form fields"""
+    full_name = data.get('fullName', '')
+    email = data.get('email', '')
+    phone = data.get('phone', '')
+    location = data.get('location', '')
+    return f"""
 Create a comprehensive professional resume in JSON format using this information:
 
 USER PROVIDED BASIC INFORMATION (USE THESE EXACT VALUES):
@@ -542,14 +2799,14 @@ USER PROVIDED BASIC INFORMATION (USE THESE EXACT VALUES):
 - Email: {email}
 - Phone: {phone}
 - Location: {location}
-- Field/Stream: {stream}
-- Specific Field: {specific_field}
-- User Type: {user_type}
-- Experience Level: {experience_level}
-- Target Role: {target_role}
-- Skills: {skills_input}
+- Field/Stream: {data.get('stream', '')}
+- Specific Field: {data.get('field', '')}
+- User Type: {data.get('userType', '')}
+- Experience Level: {data.get('experienceLevel', '')}
+- Target Role: {data.get('targetRole', '')}
+- Skills: {data.get('skills', '')}
 
-USER BACKGROUND DESCRIPTION: "{user_prompt}"
+USER BACKGROUND DESCRIPTION: "{data.get('prompt', '')}"
 
 CRITICAL INSTRUCTIONS:
 1. USE the exact basic information provided above - DO NOT change names or contact details
@@ -629,77 +2886,1059 @@ IMPORTANT:
 - Output ONLY JSON, no other text
 """
 
-        print("Sending enhanced prompt to AI...")
-        client = Groq(api_key=api_key)
-        chat_completion = client.chat.completions.create(
-            messages=[{"role": "user", "content": enhanced_prompt}],
-            model="llama-3.1-8b-instant",
-            temperature=0.1,
-            max_tokens=2500
-        )
+# ✅ USE BASIC INFO FROM FORM, NOT FROM PROMPT EXTRACTION
+RESUME_BASIC_INFO_DEFAULTS = {
+    'fullName': 'Your Name',
+    'email': 'your.email@example.com',
+    'phone': '+1 234 567 8900',
+    'location': 'Your Location'
+}
+
+DEFAULT_RESUME_LANGUAGES = [
+    {"language": "English", "proficiency": "Fluent"},
+    {"language": "Hindi", "proficiency": "Native"}
+]
+
+# ✅ TYPED RESUME MODEL
+JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+def encode_json(value):
+    """Compact JSON bytes, through orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return JSON_ENCODER.encode(value).encode('utf-8')
+
+def resume_text(value):
+    """Scalar LLM value as stripped text; numbers keep their string form"""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return ''
+
+def resume_text_list(value):
+    """Non-empty strings from a list, or from a comma-separated string"""
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, list):
+        return []
+    items = [resume_text(item) for item in value]
+    return [item for item in items if item]
+
+def resume_free_list(value):
+    """Free-form list sections keep non-empty strings and objects"""
+    if not isinstance(value, list):
+        return []
+    items = []
+    for item in value:
+        if isinstance(item, str) and item.strip():
+            items.append(item.strip())
+        elif isinstance(item, dict) and item:
+            items.append(item)
+    return items
+
+class ResumeEntry:
+    """Base for the typed entries of resume list sections.
+
+    Field names are the JSON keys, so orjson can serialize entries directly.
+    Fields are declared as an optional `id: int`, then text, then lists.
+    """
+    __slots__ = ()
+    # Set by @resume_entry
+    has_id = False
+    text_fields = ()
+    list_fields = ()
+    field_names = ()
+
+    @classmethod
+    def from_dict(cls, value, index):
+        """Typed entry from one LLM list item, or None if it has no content"""
+        if not isinstance(value, dict):
+            return None
+        texts = [resume_text(value.get(key)) for key in cls.text_fields]
+        lists = [resume_text_list(value.get(key)) for key in cls.list_fields]
+        if not any(texts) and not any(lists):
+            return None
+        if cls.has_id:
+            entry_id = value.get('id')
+            if not isinstance(entry_id, int) or isinstance(entry_id, bool):
+                entry_id = index
+            return cls(entry_id, *texts, *lists)
+        return cls(*texts, *lists)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.field_names}
+
+def resume_entry(cls):
+    """Make a ResumeEntry subclass a slots dataclass and record its field layout"""
+    cls = dataclass(slots=True)(cls)
+    entry_fields = fields(cls)
+    cls.has_id = entry_fields[0].name == 'id'
+    cls.text_fields = tuple(f.name for f in entry_fields if f.type is str)
+    cls.list_fields = tuple(f.name for f in entry_fields if f.type is list)
+    cls.field_names = tuple(f.name for f in entry_fields)
+    return cls
+
+@resume_entry
+class EducationEntry(ResumeEntry):
+    id: int
+    degree: str
+    school: str
+    year: str
+    score: str
+
+@resume_entry
+class ProjectEntry(ResumeEntry):
+    title: str
+    description: str
+    technologies: list
+
+@resume_entry
+class WorkExperienceEntry(ResumeEntry):
+    id: int
+    company: str
+    position: str
+    startDate: str
+    endDate: str
+    description: str
+
+@resume_entry
+class InternshipEntry(ResumeEntry):
+    id: int
+    company: str
+    role: str
+    duration: str
+    description: str
+
+@resume_entry
+class ExtraCurricularEntry(ResumeEntry):
+    activity: str
+    role: str
+    duration: str
+    achievements: str
+
+@resume_entry
+class LanguageEntry(ResumeEntry):
+    language: str
+    proficiency: str
+
+def resume_entries(entry_class, value):
+    if not isinstance(value, list):
+        return []
+    entries = []
+    for item in value:
+        entry = entry_class.from_dict(item, len(entries) + 1)
+        if entry is not None:
+            entries.append(entry)
+    return entries
+
+# Section -> coercion to its type (text, list of strings, free-form list or ResumeEntry subclass)
+RESUME_SECTION_TYPES = {
+    'fullName': resume_text,
+    'email': resume_text,
+    'phone': resume_text,
+    'location': resume_text,
+    'jobTitle': resume_text,
+    'summary': resume_text,
+    'education': EducationEntry,
+    'skills': resume_text_list,
+    'projects': ProjectEntry,
+    'workExperience': WorkExperienceEntry,
+    'internships': InternshipEntry,
+    'extraCurricular': ExtraCurricularEntry,
+    'languages': LanguageEntry,
+    'certifications': resume_free_list,
+    'achievements': resume_free_list,
+}
+
+def coerce_resume_section(section, value):
+    kind = RESUME_SECTION_TYPES[section]
+    if isinstance(kind, type):
+        return resume_entries(kind, value)
+    return kind(value)
+
+def finalize_resume_section(section, value, data):
+    """Apply the form overrides, quality fixes and defaults to one coerced section"""
+    if section in RESUME_BASIC_INFO_DEFAULTS:
+        return resume_text(data.get(section)) or value or RESUME_BASIC_INFO_DEFAULTS[section]
+    
+    if section == 'skills':
+        skills = canonicalize_skills(value)
+        # Add skill recommendations if skills are minimal
+        if len(skills) < 8:
+            skills += get_recommended_skills(data.get('field') or data.get('stream', ''), data.get('experienceLevel', ''), skills)[:5]
+        return skills
+    
+    if section == 'summary':
+        if not value:
+            value = default_summary(resume_text(data.get('experienceLevel')), resume_text(data.get('stream') or data.get('field')))
+        return validate_summary_length(value)
+    
+    if section == 'jobTitle' and not value:
+        return generate_professional_title(data.get('prompt', ''), data.get('field', ''), data.get('experienceLevel', ''))
+    
+    if section == 'languages' and not value:
+        return [LanguageEntry.from_dict(language, 0) for language in DEFAULT_RESUME_LANGUAGES]
+    
+    return value
+
+@dataclass(slots=True)
+class ResumeData:
+    """Validated resume as sent to the frontend; build it with from_dict"""
+    fullName: str
+    email: str
+    phone: str
+    location: str
+    jobTitle: str
+    summary: str
+    education: list
+    skills: list
+    projects: list
+    workExperience: list
+    internships: list
+    extraCurricular: list
+    languages: list
+    certifications: list
+    achievements: list
+
+    @classmethod
+    def from_dict(cls, resume_data, data=None):
+        """One validation pass over a resume dict.
+
+        With the request form `data`, the form overrides and defaults are applied
+        too, as needed for raw LLM output. Without it the dict is only coerced
+        to the schema (cache hits, rule-based fallbacks).
+        """
+        if not isinstance(resume_data, dict):
+            resume_data = {}
+        values = []
+        for section in RESUME_SECTIONS:
+            value = coerce_resume_section(section, resume_data.get(section))
+            if data is not None:
+                value = finalize_resume_section(section, value, data)
+            values.append(value)
+        return cls(*values)
+
+    @classmethod
+    def from_cache(cls, entry):
+        """Rebuild a resume stored by to_dict without validating it again.
+
+        List sections keep their plain dicts; entries written before a schema
+        change go through from_dict instead.
+        """
+        try:
+            return cls(*map(entry.__getitem__, RESUME_SECTIONS))
+        except (KeyError, TypeError):
+            return cls.from_dict(entry)
+
+    def to_dict(self):
+        return {section: resume_section_json(getattr(self, section)) for section in RESUME_SECTIONS}
+
+    def to_json(self):
+        # orjson serializes the dataclasses as they are; the stdlib path needs plain dicts
+        if orjson is not None:
+            return orjson.dumps(self)
+        return encode_json(self.to_dict())
+
+# Sections in output order
+RESUME_SECTIONS = tuple(f.name for f in fields(ResumeData))
+
+def resume_section_json(value):
+    if value and isinstance(value, list) and isinstance(value[0], ResumeEntry):
+        return [entry.to_dict() for entry in value]
+    return value
+
+def normalize_resume_section(section, value):
+    """JSON-ready value of one user-edited section: types are normalized, nothing is overridden or filled in"""
+    return resume_section_json(coerce_resume_section(section, value))
+
+def postprocess_resume_section(section, value, data):
+    """JSON-ready value of one streamed LLM section after validation and the form overrides"""
+    return resume_section_json(finalize_resume_section(section, coerce_resume_section(section, value), data))
+
+def resume_response(resume, cache_status=None):
+    """{"resumeData": ...} response serialized straight from the typed model"""
+    response = Response(b'{"resumeData":' + resume.to_json() + b'}', mimetype='application/json')
+    if cache_status:
+        response.headers['X-Cache'] = cache_status
+    return response
+
+def create_resume_fallback(data):
+    """Rule-based resume built from the form when the LLM output is unusable"""
+    metrics.inc('resume_fallbacks_total')
+    return ResumeData.from_dict(create_enhanced_resume_from_data(
+        data.get('fullName', ''), 
+        data.get('email', ''), 
+        data.get('phone', ''), 
+        data.get('location', ''), 
+        data.get('prompt', ''), 
+        detect_content_type(data.get('prompt', '')),
+        data.get('stream', ''),
+        data.get('field', ''),
+        data.get('experienceLevel', '')
+    ))
+
+def generate_resume_data(data, read_cache=True, write_cache=True, use_fallback=True):
+    """Cache lookup, LLM call, post-processing and fallback for one form.
+
+    Returns (resume, cache_status): a ResumeData and one of HIT, MISS or BYPASS.
+    With use_fallback=False an unusable LLM answer raises instead of falling back.
+    """
+    cache_key = resume_cache_key(data, LLM_MODEL)
+    if read_cache:
+        with timed_stage('cache'):
+            cached_resume = resume_cache.get(cache_key)
+        if cached_resume is not None:
+            log_event("Serving cached resume", level=logging.DEBUG)
+            metrics.inc('resume_generations_total', (('source', 'cache'),))
+            return ResumeData.from_cache(cached_resume), 'HIT'
+
+    # ✅ ENHANCED PROMPT WITH NEW SECTIONS
+    with timed_stage('prompt'):
+        enhanced_prompt = build_resume_prompt(data)
+
+    release_db_connection()
+    try:
+        with timed_stage('llm'):
+            # Same prompt, same cached resume: concurrent misses may share the call
+            chat_completion = llm_client.create(
+                messages=[{"role": "user", "content": enhanced_prompt}],
+                model=LLM_MODEL,
+                temperature=0.1,
+                max_tokens=2500,
+                coalesce=True
+            )
         
         ai_content = chat_completion.choices[0].message.content.strip()
-        print("AI Raw Output:", ai_content)
-        
-        resume_data = extract_json_from_text(ai_content)
+        log_payload("AI raw output", output=ai_content)
         
-        if not resume_data:
-            print("❌ AI returned invalid JSON, using enhanced fallback...")
-            resume_data = create_enhanced_resume_from_data(full_name, email, phone, location, user_prompt, content_type, stream, specific_field, experience_level)
+        with timed_stage('extract'):
+            resume_data = extract_json_from_text(ai_content)
+    except LLMUnavailableError as e:
+        log_event("LLM unavailable", level=logging.WARNING, error=str(e))
+        if not use_fallback:
+            raise
+        resume_data = None
+    
+    with timed_stage('postprocess'):
+        if not resume_data or not isinstance(resume_data, dict):
+            if not use_fallback:
+                raise ValueError("No valid JSON from AI")
+            log_event("No valid JSON from AI, using fallback", level=logging.WARNING)
+            metrics.inc('resume_generations_total', (('source', 'fallback'),))
+            resume = create_resume_fallback(data)
         else:
-            print("✅ AI returned valid JSON")
-            # ✅ ENSURE BASIC INFO IS PRESERVED
-            resume_data['fullName'] = full_name or resume_data.get('fullName', 'Your Name')
-            resume_data['email'] = email or resume_data.get('email', 'your.email@example.com')
-            resume_data['phone'] = phone or resume_data.get('phone', '+1 234 567 8900')
-            resume_data['location'] = location or resume_data.get('location', 'Your Location')
-            
-            # Ensure jobTitle exists and is appropriate
-            if 'jobTitle' not in resume_data:
-                resume_data['jobTitle'] = generate_professional_title(user_prompt, specific_field, experience_level)
+            metrics.inc('resume_generations_total', (('source', 'llm'),))
+            resume = ResumeData.from_dict(resume_data, data)
             
-            # Ensure languages section exists with defaults
-            if 'languages' not in resume_data:
-                resume_data['languages'] = [
-                    {"language": "English", "proficiency": "Fluent"},
-                    {"language": "Hindi", "proficiency": "Native"}
-                ]
-            
-            # Add skill recommendations if skills are minimal
-            if 'skills' in resume_data and len(resume_data['skills']) < 8:
-                recommended_skills = get_recommended_skills(specific_field or stream, experience_level, resume_data['skills'])
-                resume_data['skills'].extend(recommended_skills[:5])
-            
-            # Validate and enhance summary
-            if 'summary' in resume_data:
-                resume_data['summary'] = validate_summary_length(resume_data['summary'])
+            # Only LLM output is cached; fallbacks should be retried next time
+            if write_cache:
+                resume_cache.set(cache_key, resume.to_dict())
+    
+    return resume, 'MISS' if read_cache else 'BYPASS'
+
+@app.route("/api/generate-resume-from-prompt", methods=['POST'])
+def generate_resume():
+    try:
+        with timed_stage('parse'):
+            data = request.get_json()
+        
+        if not data:
+            return jsonify({"error": "No JSON data received"}), 400
+        
+        if payload_sampled_var.get():
+            log_payload("Resume request", form=data, content_type=detect_content_type(data.get('prompt', '')))
+        
+        if not llm_client.configured:
+            return jsonify({"error": "GROQ_API_KEY environment variable is not set"}), 500
+        
+        # Cache-Control: no-cache skips the lookup, no-store also skips storing the result
+        resume, cache_status = generate_resume_data(
+            data,
+            read_cache=not (request.cache_control.no_cache or request.cache_control.no_store),
+            write_cache=not request.cache_control.no_store
+        )
         
-        print("📤 SENDING ENHANCED DATA TO FRONTEND:", resume_data)
-        return jsonify({"resumeData": resume_data})
+        with timed_stage('serialize'):
+            response = resume_response(resume, cache_status)
+        if payload_sampled_var.get():
+            log_payload("Resume response", resume=response.get_data(as_text=True))
+        return response
         
     except Exception as e:
-        print("❌ ERROR:", str(e))
+        log_event("Error generating resume", level=logging.ERROR, error=str(e))
         # Always return a valid resume using fallback
-        resume_data = create_enhanced_resume_from_data(
-            data.get('fullName', ''), 
-            data.get('email', ''), 
-            data.get('phone', ''), 
-            data.get('location', ''), 
-            data.get('prompt', ''), 
-            detect_content_type(data.get('prompt', '')),
-            data.get('stream', ''),
-            data.get('field', ''),
-            data.get('experienceLevel', '')
+        return resume_response(create_resume_fallback(data))
+
+# ✅ ASYNC RESUME JOBS
+def claim_resume_job(job_id):
+    """Atomically move a queued job to running; False if another worker got it first"""
+    claimed = ResumeJob.query.filter_by(id=job_id, status='queued').update(
+        {"status": "running", "started_at": datetime.utcnow()}, synchronize_session=False
+    )
+    db.session.commit()
+    return claimed == 1
+
+def run_resume_job(job_id):
+    """Process one job; must run inside an app context"""
+    if not claim_resume_job(job_id):
+        return
+    job = db.session.get(ResumeJob, job_id)
+    try:
+        try:
+            resume, _ = generate_resume_data(job.payload)
+            job.result = resume.to_dict()
+        except Exception as e:
+            log_event("Error in resume job", level=logging.ERROR, error=str(e))
+            db.session.rollback()
+            job.result = create_resume_fallback(job.payload).to_dict()
+        job.status = 'succeeded'
+    except Exception as e:
+        db.session.rollback()
+        job.status = 'failed'
+        job.error = str(e)
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+
+class ResumeJobQueue:
+    """Bounded in-process worker pool for async resume jobs.
+
+    The database is the source of truth, so jobs submitted here can also be
+    picked up by `flask run-resume-jobs` if this process goes away.
+    """
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, job_id):
+        if not self.max_workers:
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='resume-job')
+        self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id):
+        with app.app_context():
+            try:
+                run_resume_job(job_id)
+            except Exception as e:
+                log_event("Error running resume job", level=logging.ERROR, error=str(e))
+
+resume_job_queue = ResumeJobQueue(app.config['RESUME_JOB_WORKERS'])
+
+def serialize_resume_job(job):
+    job_data = {
+        "job_id": job.id,
+        "status": job.status,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None
+    }
+    if job.status == 'succeeded':
+        job_data["resumeData"] = job.result
+    elif job.status == 'failed':
+        job_data["error"] = job.error
+    return job_data
+
+@app.route("/api/resume-jobs", methods=['POST'])
+@require_auth
+def create_resume_job():
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({"error": "No JSON data received"}), 400
+        
+        # Client retries with the same Idempotency-Key land on the same job
+        idempotency_key = request.headers.get('Idempotency-Key') or None
+        if idempotency_key:
+            job = ResumeJob.query.filter_by(idempotency_key=idempotency_key).first()
+            if job is not None:
+                if job.user_id != g.auth_user.id or job.payload != data:
+                    return jsonify({"error": "Idempotency-Key was already used with a different request"}), 422
+                return jsonify(serialize_resume_job(job)), 200
+        
+        job = ResumeJob(user_id=g.auth_user.id, idempotency_key=idempotency_key, payload=data)
+        db.session.add(job)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Lost a race with a concurrent retry carrying the same key
+            db.session.rollback()
+            job = ResumeJob.query.filter_by(idempotency_key=idempotency_key).first()
+            if job is None or job.user_id != g.auth_user.id or job.payload != data:
+                return jsonify({"error": "Idempotency-Key was already used with a different request"}), 422
+            return jsonify(serialize_resume_job(job)), 200
+        
+        resume_job_queue.submit(job.id)
+        response = jsonify(serialize_resume_job(job))
+        response.headers['Location'] = f"/api/resume-jobs/{job.id}"
+        return response, 202
+        
+    except Exception as e:
+        log_event("Error creating resume job", level=logging.ERROR, error=str(e))
+        return jsonify({"error": "Failed to create job"}), 500
+
+@app.route("/api/resume-jobs/<job_id>", methods=['GET'])
+@require_auth
+def get_resume_job(job_id):
+    job = ResumeJob.query.filter_by(id=job_id, user_id=g.auth_user.id).first()
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(serialize_resume_job(job))
+
+@app.cli.command('run-resume-jobs')
+@click.option('--workers', default=4, show_default=True, help='Jobs processed concurrently.')
+@click.option('--poll', default=0.0, help='Keep polling for new jobs every N seconds instead of exiting when the queue is empty.')
+@click.option('--stale-after', default=600, show_default=True, help='Requeue jobs stuck in running for this many seconds.')
+@click.option('--keep-days', default=7.0, show_default=True, help='Delete finished jobs older than this many days.')
+def run_resume_jobs_command(workers, poll, stale_after, keep_days):
+    """Process queued async resume jobs from the database and delete old finished ones."""
+    if app.config['DB_AUTO_CREATE']:
+        table_initializer.ensure()
+
+    def run(job_id):
+        with app.app_context():
+            run_resume_job(job_id)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            # Jobs left running by a worker that died are put back in the queue
+            requeued = ResumeJob.query.filter(
+                ResumeJob.status == 'running',
+                ResumeJob.started_at < datetime.utcnow() - timedelta(seconds=stale_after)
+            ).update({"status": "queued"}, synchronize_session=False)
+            # Finished jobs keep personal data, so they are only kept long enough to be fetched
+            deleted = ResumeJob.query.filter(
+                ResumeJob.status.in_(['succeeded', 'failed']),
+                ResumeJob.finished_at < datetime.utcnow() - timedelta(days=keep_days)
+            ).delete(synchronize_session=False)
+            db.session.commit()
+            if deleted:
+                click.echo(f"🧹 Deleted {deleted} finished resume jobs older than {keep_days:g} days")
+            job_ids = [job_id for job_id, in db.session.query(ResumeJob.id).filter_by(status='queued').order_by(ResumeJob.created_at)]
+            if job_ids or requeued:
+                click.echo(f"🧾 Processing {len(job_ids)} queued resume jobs ({requeued} requeued)")
+            list(executor.map(run, job_ids))
+            if not poll:
+                break
+            time.sleep(poll)
+
+# ✅ STORED RESUMES (versioning and section regeneration)
+RESUME_VERSION_SNAPSHOT_EVERY = 20
+
+# Section -> (JSON shape asked from the LLM, max_tokens for the completion)
+RESUME_SECTION_REGENERATION = {
+    'jobTitle': ('"Professional title based on background and field"', 40),
+    'summary': ('"50-80 word professional summary"', 250),
+    'skills': ('["10-15 relevant technical and soft skills"]', 200),
+    'education': ('[{"id": 1, "degree": "Degree", "school": "School", "year": "Year", "score": "Score or \'\'"}]', 400),
+    'projects': ('[{"title": "Project title", "description": "Project description", "technologies": ["tech used"]}]', 600),
+    'workExperience': ('[{"id": 1, "company": "Company", "position": "Position", "startDate": "Start date", "endDate": "End date", "description": "Responsibilities and achievements"}]', 600),
+    'internships': ('[{"id": 1, "company": "Company", "role": "Intern role", "duration": "Duration", "description": "Learning and contributions"}]', 500),
+    'extraCurricular': ('[{"activity": "Activity", "role": "Role played", "duration": "Duration", "achievements": "Key achievements"}]', 400),
+    'certifications': ('["Certification name and issuer"]', 200),
+    'achievements': ('["Achievement"]', 250),
+}
+
+def serialize_stored_resume(resume, include_data=True):
+    result = {
+        "id": resume.id,
+        "title": resume.title,
+        "version": resume.version,
+        "created_at": resume.created_at.isoformat() if resume.created_at else None,
+        "updated_at": resume.updated_at.isoformat() if resume.updated_at else None
+    }
+    if include_data:
+        result["resumeData"] = resume.data
+    return result
+
+def get_user_resume(resume_id):
+    """The authenticated user's resume with this id, or None"""
+    return StoredResume.query.filter_by(id=resume_id, user_id=g.auth_user.id).first()
+
+def resume_at_version(resume_id, version):
+    """Rebuild a past version by replaying deltas from the nearest full snapshot; None if it does not exist"""
+    base = version - (version - 1) % RESUME_VERSION_SNAPSHOT_EVERY
+    versions = ResumeVersion.query.filter(
+        ResumeVersion.resume_id == resume_id,
+        ResumeVersion.version.between(base, version)
+    ).order_by(ResumeVersion.version).all()
+    if not versions or versions[-1].version != version:
+        return None
+    data = {}
+    for resume_version in versions:
+        data.update(resume_version.changes)
+    return data
+
+def commit_resume_version(resume, changes, reason):
+    """Apply changed sections as a new version; returns the changes actually made.
+
+    Raises IntegrityError if a concurrent request created the same version first.
+    """
+    changes = {section: value for section, value in changes.items() if resume.data.get(section) != value}
+    if not changes:
+        return changes
+    resume.data = {**resume.data, **changes}
+    resume.version += 1
+    resume.updated_at = datetime.utcnow()
+    full_snapshot = resume.version % RESUME_VERSION_SNAPSHOT_EVERY == 1
+    db.session.add(ResumeVersion(
+        resume_id=resume.id,
+        version=resume.version,
+        changes=resume.data if full_snapshot else changes,
+        reason=reason
+    ))
+    db.session.commit()
+    return changes
+
+def diff_resume_data(old, new):
+    """Section-level diff; lists of strings also report the added and removed items"""
+    diff = {}
+    for section in RESUME_SECTIONS:
+        before, after = old.get(section), new.get(section)
+        if before == after:
+            continue
+        change = {"from": before, "to": after}
+        if isinstance(before, list) and isinstance(after, list) and all(isinstance(item, str) for item in before + after):
+            change["added"] = [item for item in after if item not in before]
+            change["removed"] = [item for item in before if item not in after]
+        diff[section] = change
+    return diff
+
+def build_section_prompt(section, resume_data, form, instructions=''):
+    """Small prompt that asks the LLM for one resume section only"""
+    shape, _ = RESUME_SECTION_REGENERATION[section]
+    prompt = f"""
+Rewrite one section of a professional resume.
+
+CANDIDATE:
+- Full Name: {resume_data.get('fullName', '')}
+- Job Title: {resume_data.get('jobTitle', '')}
+- Field/Stream: {form.get('stream', '')}
+- Specific Field: {form.get('field', '')}
+- Experience Level: {form.get('experienceLevel', '')}
+- Target Role: {form.get('targetRole', '')}
+
+USER BACKGROUND DESCRIPTION: "{form.get('prompt', '')}"
+
+CURRENT "{section}": {json.dumps(resume_data.get(section), ensure_ascii=False)}
+"""
+    if instructions:
+        prompt += f'\nUSER INSTRUCTIONS: "{instructions}"\n'
+    prompt += f"""
+Return ONLY this JSON, with no other text:
+{{"{section}": {shape}}}
+"""
+    return prompt
+
+def regenerate_resume_section(section, resume_data, form, instructions=''):
+    """(value, total_tokens) for one freshly generated section; value is None if the LLM output was unusable"""
+    _, max_tokens = RESUME_SECTION_REGENERATION[section]
+    release_db_connection()
+    chat_completion = llm_client.create(
+        messages=[{"role": "user", "content": build_section_prompt(section, resume_data, form, instructions)}],
+        model=LLM_MODEL,
+        temperature=0.7,
+        max_tokens=max_tokens
+    )
+    usage = getattr(chat_completion, 'usage', None)
+    total_tokens = getattr(usage, 'total_tokens', None)
+    parsed = extract_json_from_text(chat_completion.choices[0].message.content)
+    if not isinstance(parsed, dict) or section not in parsed:
+        return None, total_tokens
+    return postprocess_resume_section(section, parsed[section], form), total_tokens
+
+@app.route("/api/resumes", methods=['POST'])
+@require_auth
+def create_stored_resume():
+    try:
+        user_id = g.auth_user.id
+        
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({"error": "No JSON data received"}), 400
+        form = data.get('form') or {}
+        if not isinstance(form, dict):
+            return jsonify({"error": "form must be an object"}), 400
+        
+        # A resume the client already has is stored as written (types normalized only, like PATCH edits);
+        # otherwise one is generated from the form
+        if isinstance(data.get('resumeData'), dict):
+            resume_data = ResumeData.from_dict(data['resumeData']).to_dict()
+        else:
+            if not form:
+                return jsonify({"error": "form or resumeData is required"}), 400
+            resume_data = generate_resume_data(form)[0].to_dict()
+        
+        resume = StoredResume(
+            user_id=user_id,
+            title=(data.get('title') or resume_data.get('jobTitle') or 'Resume')[:200],
+            form=form,
+            data=resume_data,
+            version=1
         )
-        return jsonify({"resumeData": resume_data})
+        db.session.add(resume)
+        db.session.flush()
+        db.session.add(ResumeVersion(resume_id=resume.id, version=1, changes=resume_data, reason='created'))
+        db.session.commit()
+        
+        response = jsonify(serialize_stored_resume(resume))
+        response.headers['Location'] = f"/api/resumes/{resume.id}"
+        return response, 201
+        
+    except Exception as e:
+        log_event("Error storing resume", level=logging.ERROR, error=str(e))
+        db.session.rollback()
+        return jsonify({"error": "Failed to store resume"}), 500
+
+@app.route("/api/resumes", methods=['GET'])
+@require_auth
+def list_stored_resumes():
+    user_id = g.auth_user.id
+    resumes = StoredResume.query.filter_by(user_id=user_id).order_by(StoredResume.updated_at.desc()).all()
+    return jsonify({"resumes": [serialize_stored_resume(resume, include_data=False) for resume in resumes]})
+
+@app.route("/api/resumes/<int:resume_id>", methods=['GET'])
+@require_auth
+def get_stored_resume(resume_id):
+    resume = get_user_resume(resume_id)
+    if resume is None:
+        return jsonify({"error": "Resume not found"}), 404
+    return jsonify(serialize_stored_resume(resume))
+
+@app.route("/api/resumes/<int:resume_id>", methods=['PATCH'])
+@require_auth
+def edit_stored_resume(resume_id):
+    """Manual edits: {"title": ..., "sections": {section: value}} creates one new version"""
+    try:
+        resume = get_user_resume(resume_id)
+        if resume is None:
+            return jsonify({"error": "Resume not found"}), 404
+        
+        data = request.get_json(silent=True) or {}
+        sections = data.get('sections') or {}
+        if not isinstance(sections, dict):
+            return jsonify({"error": "sections must be an object"}), 400
+        unknown = [section for section in sections if section not in RESUME_SECTION_TYPES]
+        if unknown:
+            return jsonify({"error": f"Unknown sections: {', '.join(unknown)}"}), 400
+        
+        if data.get('title'):
+            resume.title = str(data['title'])[:200]
+        # The user's edit is kept as written: no form overrides, skill top-up or defaults
+        changes = {section: normalize_resume_section(section, value) for section, value in sections.items()}
+        try:
+            changes = commit_resume_version(resume, changes, 'edit')
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"error": "Resume was modified concurrently, please retry"}), 409
+        
+        result = serialize_stored_resume(resume)
+        result["changed"] = sorted(changes)
+        return jsonify(result)
+        
+    except Exception as e:
+        log_event("Error editing resume", level=logging.ERROR, error=str(e))
+        db.session.rollback()
+        return jsonify({"error": "Failed to edit resume"}), 500
+
+@app.route("/api/resumes/<int:resume_id>/sections/<section>/regenerate", methods=['POST'])
+@require_auth
+def regenerate_stored_resume_section(resume_id, section):
+    """Regenerate one section with a section-scoped prompt instead of the whole resume"""
+    try:
+        resume = get_user_resume(resume_id)
+        if resume is None:
+            return jsonify({"error": "Resume not found"}), 404
+        if section not in RESUME_SECTION_REGENERATION:
+            return jsonify({"error": f"Section cannot be regenerated: {section}"}), 400
+        if not llm_client.configured:
+            return jsonify({"error": "GROQ_API_KEY environment variable is not set"}), 500
+        
+        data = request.get_json(silent=True) or {}
+        instructions = str(data.get('instructions') or '')[:500]
+        try:
+            value, total_tokens = regenerate_resume_section(section, resume.data, resume.form, instructions)
+        except LLMUnavailableError as e:
+            log_event("LLM unavailable", level=logging.WARNING, error=str(e))
+            return jsonify({"error": "AI service is temporarily unavailable"}), 503
+        if value is None:
+            return jsonify({"error": "AI returned an unusable section, please retry"}), 502
+        
+        try:
+            commit_resume_version(resume, {section: value}, f"regenerate:{section}")
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"error": "Resume was modified concurrently, please retry"}), 409
+        
+        result = serialize_stored_resume(resume, include_data=False)
+        result.update({"section": section, "value": value, "total_tokens": total_tokens})
+        return jsonify(result)
+        
+    except Exception as e:
+        log_event("Error regenerating resume section", level=logging.ERROR, error=str(e))
+        db.session.rollback()
+        return jsonify({"error": "Failed to regenerate section"}), 500
+
+@app.route("/api/resumes/<int:resume_id>/versions", methods=['GET'])
+@require_auth
+def list_resume_versions(resume_id):
+    resume = get_user_resume(resume_id)
+    if resume is None:
+        return jsonify({"error": "Resume not found"}), 404
+    versions = db.session.query(ResumeVersion.version, ResumeVersion.reason, ResumeVersion.created_at).filter_by(
+        resume_id=resume.id
+    ).order_by(ResumeVersion.version.desc()).all()
+    return jsonify({
+        "current": resume.version,
+        "versions": [
+            {"version": version, "reason": reason, "created_at": created_at.isoformat() if created_at else None}
+            for version, reason, created_at in versions
+        ]
+    })
+
+@app.route("/api/resumes/<int:resume_id>/versions/<int:version>", methods=['GET'])
+@require_auth
+def get_resume_version(resume_id, version):
+    resume = get_user_resume(resume_id)
+    if resume is None:
+        return jsonify({"error": "Resume not found"}), 404
+    data = resume.data if version == resume.version else resume_at_version(resume.id, version)
+    if data is None:
+        return jsonify({"error": "Version not found"}), 404
+    return jsonify({"id": resume.id, "version": version, "resumeData": data})
+
+@app.route("/api/resumes/<int:resume_id>/diff", methods=['GET'])
+@require_auth
+def diff_resume_versions(resume_id):
+    """?from=<version>&to=<version>; defaults to the latest change"""
+    resume = get_user_resume(resume_id)
+    if resume is None:
+        return jsonify({"error": "Resume not found"}), 404
+    to_version = request.args.get('to', resume.version, type=int)
+    from_version = request.args.get('from', to_version - 1, type=int)
+    
+    old = resume_at_version(resume.id, from_version)
+    new = resume.data if to_version == resume.version else resume_at_version(resume.id, to_version)
+    if old is None or new is None:
+        return jsonify({"error": "Version not found"}), 404
+    return jsonify({"from": from_version, "to": to_version, "changes": diff_resume_data(old, new)})
+
+@app.route("/api/resumes/<int:resume_id>/versions/<int:version>/restore", methods=['POST'])
+@require_auth
+def restore_resume_version(resume_id, version):
+    """Restoring creates a new version, so it can be undone like any other change"""
+    try:
+        resume = get_user_resume(resume_id)
+        if resume is None:
+            return jsonify({"error": "Resume not found"}), 404
+        data = resume_at_version(resume.id, version)
+        if data is None:
+            return jsonify({"error": "Version not found"}), 404
+        
+        try:
+            changes = commit_resume_version(resume, data, f"restore:{version}")
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"error": "Resume was modified concurrently, please retry"}), 409
+        
+        result = serialize_stored_resume(resume)
+        result["changed"] = sorted(changes)
+        return jsonify(result)
+        
+    except Exception as e:
+        log_event("Error restoring resume version", level=logging.ERROR, error=str(e))
+        db.session.rollback()
+        return jsonify({"error": "Failed to restore version"}), 500
+
+# ✅ BATCH RESUME GENERATION
+def run_batch_record(line_number, line, limiter):
+    """Result for one JSONL form; LLM failures fall back to the rule-based resume"""
+    try:
+        form = json.loads(line)
+    except json.JSONDecodeError:
+        return {"line": line_number, "status": "error", "error": "Invalid JSON"}
+    if not isinstance(form, dict):
+        return {"line": line_number, "status": "error", "error": "Record must be a JSON object"}
+    
+    try:
+        limiter.wait()
+        resume, cache_status = generate_resume_data(form, use_fallback=False)
+        return {"line": line_number, "status": "ok", "cache": cache_status, "resumeData": resume.to_dict()}
+    except Exception as e:
+        log_event("Error in batch record", level=logging.ERROR, line=line_number, error=str(e))
+        db.session.rollback()
+        return {
+            "line": line_number,
+            "status": "fallback",
+            "error": f"{type(e).__name__}: {e}",
+            "resumeData": create_resume_fallback(form).to_dict()
+        }
+
+def generate_resume_batch(lines, max_workers, rate_per_second, max_records=None):
+    """Yield one result per non-blank JSONL line, in input order, then a final {"stats": ...} line.
+
+    Records fan out over `max_workers` threads with at most 2x that many in
+    flight, so results stream back while later records are still being read.
+    """
+    limiter = RateLimiter(rate_per_second)
+    stats = {"records": 0, "ok": 0, "fallback": 0, "error": 0, "cache_hits": 0, "skipped": 0}
+    error_types = {}
+    started = time.monotonic()
+    
+    def process(line_number, line):
+        with app.app_context():
+            return run_batch_record(line_number, line, limiter)
+    
+    def finish(result):
+        stats[result["status"]] += 1
+        if result.get("cache") == 'HIT':
+            stats["cache_hits"] += 1
+        if "error" in result:
+            error_type = result["error"].split(':', 1)[0] if result["status"] == 'fallback' else 'InvalidRecord'
+            error_types[error_type] = error_types.get(error_type, 0) + 1
+        return result
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            if max_records is not None and stats["records"] >= max_records:
+                stats["skipped"] += 1
+                continue
+            stats["records"] += 1
+            pending.append(executor.submit(process, line_number, line))
+            if len(pending) >= max_workers * 2:
+                yield finish(pending.popleft().result())
+        while pending:
+            yield finish(pending.popleft().result())
+    
+    elapsed = time.monotonic() - started
+    stats.update({
+        "error_types": error_types,
+        "elapsed_seconds": round(elapsed, 3),
+        "records_per_second": round(stats["records"] / elapsed, 2) if elapsed else None
+    })
+    yield {"stats": stats}
+
+@app.route("/api/generate-resumes/batch", methods=['POST'])
+@require_auth
+def generate_resume_batch_endpoint():
+    """JSONL in (one generate-resume-from-prompt form per line), JSONL out in the same order"""
+    if not llm_client.configured:
+        return jsonify({"error": "GROQ_API_KEY environment variable is not set"}), 500
+    lines = request.get_data(as_text=True).splitlines()
+    if not any(line.strip() for line in lines):
+        return jsonify({"error": "No JSONL records received"}), 400
+    
+    results = generate_resume_batch(
+        lines,
+        max_workers=app.config['BATCH_RESUME_WORKERS'],
+        rate_per_second=app.config['BATCH_RESUME_RATE'],
+        max_records=app.config['BATCH_RESUME_MAX_RECORDS']
+    )
+    return Response(stream_with_context(json.dumps(result) + "\n" for result in results), mimetype='application/x-ndjson', headers={
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.cli.command('generate-resumes')
+@click.argument('input_file', type=click.File('r'))
+@click.argument('output_file', type=click.File('w'), default='-')
+@click.option('--workers', default=4, show_default=True, help='Maximum LLM requests in flight.')
+@click.option('--rate', default=2.0, show_default=True, help='Maximum LLM requests per second.')
+def generate_resumes_command(input_file, output_file, workers, rate):
+    """Generate resumes for a JSONL file of forms ('-' for stdin/stdout)."""
+    if not llm_client.configured:
+        raise click.ClickException("GROQ_API_KEY not set")
+    if app.config['DB_AUTO_CREATE']:
+        table_initializer.ensure()
+    for result in generate_resume_batch(input_file, max_workers=workers, rate_per_second=rate):
+        output_file.write(json.dumps(result) + "\n")
+        output_file.flush()
+        if "stats" in result:
+            click.echo(f"✅ Batch finished: {result['stats']}", err=True)
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route("/api/generate-resume-from-prompt/stream", methods=['POST'])
+def generate_resume_stream():
+    """Server-Sent Events variant: each resume section is sent as soon as it is complete"""
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({"error": "No JSON data received"}), 400
+    if not llm_client.configured:
+        return jsonify({"error": "GROQ_API_KEY environment variable is not set"}), 500
+    
+    use_cache = not (request.cache_control.no_cache or request.cache_control.no_store)
+    store_result = not request.cache_control.no_store
+    cache_key = resume_cache_key(data, LLM_MODEL)
+    
+    def events():
+        resume_data = {}
+        
+        def emit(section, value):
+            resume_data[section] = value
+            return sse_event('section', {"section": section, "value": value})
+        
+        cached_resume = resume_cache.get(cache_key) if use_cache else None
+        if cached_resume is not None:
+            for section, value in cached_resume.items():
+                yield emit(section, value)
+            yield sse_event('done', {"resumeData": resume_data, "cache": "HIT"})
+            return
+        
+        # Contact details come from the form, so they can be sent before the LLM answers
+        for section in RESUME_BASIC_INFO_DEFAULTS:
+            yield emit(section, postprocess_resume_section(section, None, data))
+        
+        parser = ResumeSectionParser()
+        release_db_connection()
+        try:
+            for delta in llm_client.stream(
+                messages=[{"role": "user", "content": build_resume_prompt(data)}],
+                model=LLM_MODEL,
+                temperature=0.1,
+                max_tokens=2500
+            ):
+                for section, value in parser.feed(delta):
+                    if section in RESUME_SECTION_TYPES and section not in RESUME_BASIC_INFO_DEFAULTS:
+                        yield emit(section, postprocess_resume_section(section, value, data))
+        except Exception as e:
+            log_event("Error streaming resume", level=logging.ERROR, error=str(e))
+        
+        from_llm = len(resume_data) > len(RESUME_BASIC_INFO_DEFAULTS)
+        if not from_llm:
+            log_event("No valid JSON from AI stream, using fallback", level=logging.WARNING)
+            for section, value in create_resume_fallback(data).to_dict().items():
+                if section not in RESUME_BASIC_INFO_DEFAULTS:
+                    yield emit(section, value)
+        
+        # Sections the LLM left out still get their defaults
+        for section in RESUME_SECTIONS:
+            if section not in resume_data:
+                yield emit(section, postprocess_resume_section(section, None, data))
+        
+        if from_llm and parser.finished and store_result:
+            resume_cache.set(cache_key, resume_data)
+        yield sse_event('done', {"resumeData": resume_data, "cache": "MISS" if use_cache else "BYPASS"})
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
 
 def create_enhanced_resume_from_data(full_name, email, phone, location, user_prompt, content_type, stream, specific_field, experience_level):
     """Create enhanced resume using all provided data with new sections"""
     
     # Extract information from prompt
-    bca_match = re.search(r'bca', user_prompt, re.IGNORECASE)
-    medicaps_match = re.search(r'medicaps', user_prompt, re.IGNORECASE)
-    choithram_match = re.search(r'choithram', user_prompt, re.IGNORECASE)
+    features = extract_prompt_features(user_prompt)
+    bca_match = features.get('bca')
+    medicaps_match = features.get('medicaps')
+    choithram_match = features.get('choithram')
     
     # Build education section
     education = []
@@ -749,6 +3988,7 @@ def create_enhanced_resume_from_data(full_name, email, phone, location, user_pro
         skills = ['Communication', 'Teamwork', 'Problem Solving', 'Time Management', 'Adaptability']
     
     # Add recommended skills
+    skills = canonicalize_skills(skills)
     recommended = get_recommended_skills(specific_field or stream, experience_level, skills)
     skills.extend(recommended[:8])
     
@@ -761,11 +4001,7 @@ def create_enhanced_resume_from_data(full_name, email, phone, location, user_pro
         summary += "Eager to apply theoretical knowledge to real-world challenges and contribute to innovative technology projects. "
         summary += "Committed to continuous learning and professional growth in the field of computer applications and software development."
     else:
-        summary = f"A dedicated {experience_level.lower() if experience_level else 'individual'} with strong educational background in {stream.lower() if stream else 'general studies'}. "
-        summary += "Excellent problem-solving abilities and quick learning capacity with passion for innovation. "
-        summary += "Strong foundation in technical principles and practical applications. "
-        summary += "Proven ability to adapt quickly and learn new technologies efficiently. "
-        summary += "Committed to continuous improvement and career growth in professional field."
+        summary = default_summary(experience_level, stream)
     
     # Ensure summary meets minimum word count
     summary = validate_summary_length(summary)
@@ -816,13 +4052,8 @@ def create_enhanced_resume_from_data(full_name, email, phone, location, user_pro
 # ✅ DEPLOYMENT: Production configuration
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all()
-    print("🚀 Server starting on http://localhost:5000")
-    print("📊 Features: Resume Generation | Skill Testing | User Authentication")
+        table_initializer.ensure()
+    log_event("Server starting", url="http://localhost:5000")
     app.run(debug=os.environ.get('FLASK_ENV') == 'development', 
             host='0.0.0.0', 
             port=int(os.environ.get('PORT', 5000)))
-else:
-    # For production deployment (Vercel, Railway, etc.)
-    with app.app_context():
-        db.create_all()
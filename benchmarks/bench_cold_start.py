@@ -0,0 +1,87 @@
+"""Cold-start cost: time to import app.py and to answer the first request.
+
+Every run is a fresh interpreter with a fresh SQLite database, as on a new
+serverless instance. --ref also measures app.py from an earlier git
+revision for comparison:
+
+    python benchmarks/bench_cold_start.py --runs 10 --ref HEAD~1
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import results
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+status = client.get('/api/health').status_code
+first = time.perf_counter()
+client.post('/api/skill-recommendations', json={"field": "Computer Science", "experienceLevel": "Student"})
+second = time.perf_counter()
+print(json.dumps({"import_ms": (imported - started) * 1000, "first_response_ms": (first - imported) * 1000,
+                  "second_response_ms": (second - first) * 1000, "status": status}))
+"""
+
+
+def run_once(source_dir):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL='sqlite:///' + os.path.join(tmp, 'cold.db'), LOG_LEVEL='WARNING',
+                   GROQ_API_KEY=os.environ.get('GROQ_API_KEY', 'fake'))
+        started = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', PROBE, source_dir], env=env, cwd=tmp,
+                                capture_output=True, text=True, check=True).stdout
+        wall = (time.perf_counter() - started) * 1000
+    timings = json.loads(output.strip().splitlines()[-1])
+    timings["process_ms"] = wall
+    return timings
+
+
+def measure(source_dir, runs):
+    samples = [run_once(source_dir) for _ in range(runs)]
+    return {key: round(statistics.median(sample[key] for sample in samples), 1)
+            for key in ("import_ms", "first_response_ms", "second_response_ms", "process_ms")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='Fresh processes per measurement; medians are reported.')
+    parser.add_argument('--ref', help='Also measure app.py at this git revision.')
+    results.add_arguments(parser, 'cold-start-results.json')
+    args = parser.parse_args()
+
+    targets = [('working tree', ROOT)]
+    ref_dir = None
+    if args.ref:
+        ref_dir = tempfile.mkdtemp()
+        source = subprocess.run(['git', 'show', f'{args.ref}:app.py'], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        with open(os.path.join(ref_dir, 'app.py'), 'w', encoding='utf-8') as f:
+            f.write(source)
+        targets.insert(0, (args.ref, ref_dir))
+
+    details = {}
+    print(f"{'app.py':>14} {'import ms':>10} {'1st request ms':>15} {'2nd request ms':>15} {'process ms':>11}")
+    for name, source_dir in targets:
+        timings = details[name] = measure(source_dir, args.runs)
+        print(f"{name:>14} {timings['import_ms']:>10.1f} {timings['first_response_ms']:>15.1f} "
+              f"{timings['second_response_ms']:>15.1f} {timings['process_ms']:>11.1f}")
+
+    current = details['working tree']
+    metrics = {"import_ms": current["import_ms"], "first_response_ms": current["first_response_ms"],
+               "process_ms": current["process_ms"]}
+    sys.exit(results.finish(args, 'cold-start', {"runs": args.runs, "ref": args.ref}, details, metrics))
+
+
+if __name__ == '__main__':
+    main()
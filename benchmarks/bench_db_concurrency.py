@@ -0,0 +1,139 @@
+"""Concurrent signup + login throughput for each database engine configuration.
+
+Every configuration runs in its own process against a fresh database, with
+the app on a local threaded server and bcrypt at 4 rounds so the database,
+not hashing, is the bottleneck. Each client loops: sign up a new user, log
+in as that user. Postgres runs are added with --postgres-url (needs a
+driver such as psycopg2 installed):
+
+    python benchmarks/bench_db_concurrency.py --clients 16 --seconds 10
+    python benchmarks/bench_db_concurrency.py --postgres-url postgresql://localhost/bench
+"""
+import argparse
+import http.client
+import itertools
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import results
+
+CONFIGS = {
+    "sqlite-rollback-journal": {"SQLITE_WAL": "0", "SQLITE_BUSY_TIMEOUT": "5"},
+    "sqlite-wal": {"SQLITE_WAL": "1"},
+}
+POSTGRES_CONFIGS = {
+    "postgres-queue-pool": {"DB_NULL_POOL": "0"},
+    "postgres-null-pool": {"DB_NULL_POOL": "1"},
+}
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else float('nan')
+
+
+def post(port, path, body):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    try:
+        connection.request('POST', path, body=json.dumps(body), headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    except (OSError, http.client.HTTPException):
+        return 'connection-error'
+    finally:
+        connection.close()
+
+
+def child(clients, seconds):
+    """Runs inside the per-configuration process; prints one JSON line"""
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import app
+    from werkzeug.serving import make_server
+
+    with app.app.app_context():
+        if not app.app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+            # Postgres is shared between runs, so every run starts from empty tables
+            app.db.drop_all()
+        app.db.create_all()
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    counter = itertools.count()
+    deadline = time.monotonic() + seconds
+    statuses = {"signup": {}, "login": {}}
+    latencies = []
+    lock = threading.Lock()
+
+    def client():
+        while time.monotonic() < deadline:
+            n = next(counter)
+            user = {"username": f"user{n}", "email": f"user{n}@example.com", "password": "correct horse"}
+            for kind, path in (("signup", '/api/signup'), ("login", '/api/login')):
+                started = time.perf_counter()
+                status = str(post(server.server_port, path, user))
+                with lock:
+                    latencies.append(time.perf_counter() - started)
+                    statuses[kind][status] = statuses[kind].get(status, 0) + 1
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    server.shutdown()
+    print(json.dumps({
+        "signups_per_s": round(statuses["signup"].get("201", 0) / seconds, 1),
+        "logins_per_s": round(statuses["login"].get("200", 0) / seconds, 1),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "statuses": statuses,
+        "engine_options": {key: str(value) for key, value in app.app.config['SQLALCHEMY_ENGINE_OPTIONS'].items()},
+    }))
+
+
+def run_config(overrides, database_url, clients, seconds):
+    env = dict(os.environ, DATABASE_URL=database_url, BCRYPT_LOG_ROUNDS='4', LOG_LEVEL='WARNING', **overrides)
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', '--clients', str(clients), '--seconds', str(seconds)],
+                            env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--postgres-url', help='Also run against this (empty, disposable) Postgres database.')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    results.add_arguments(parser, 'db-concurrency-results.json')
+    args = parser.parse_args()
+    if args.child:
+        return child(args.clients, args.seconds)
+
+    runs = [(name, overrides, 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')) for name, overrides in CONFIGS.items()]
+    if args.postgres_url:
+        runs += [(name, overrides, args.postgres_url) for name, overrides in POSTGRES_CONFIGS.items()]
+
+    details = {}
+    metrics = {}
+    print(f"{args.clients} clients, {args.seconds:.0f}s per configuration")
+    print(f"{'configuration':>24} {'signups/s':>10} {'logins/s':>9} {'p50 ms':>7} {'p99 ms':>7}  non-2xx")
+    for name, overrides, database_url in runs:
+        result = details[name] = run_config(overrides, database_url, args.clients, args.seconds)
+        failures = {f"{kind} {status}": count for kind, by_status in result["statuses"].items()
+                    for status, count in by_status.items() if not status.startswith('2')}
+        print(f"{name:>24} {result['signups_per_s']:>10.1f} {result['logins_per_s']:>9.1f} {result['p50_ms']:>7.1f} "
+              f"{result['p99_ms']:>7.1f}  {failures or '-'}")
+        metrics[f"{name}.p99_ms"] = result["p99_ms"]
+    sys.exit(results.finish(args, 'db-concurrency', {"clients": args.clients, "seconds": args.seconds}, details, metrics))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Parse-success rate and cost of extract_json_from_text over recorded LLM outputs.
+
+Each line of llm_output_corpus.jsonl holds an LLM answer and the keys a
+successful parse must contain (null when the output is unrecoverable and
+the extractor is expected to give up). The script exits with status 1
+when app.extract_json_from_text parses less than --min-success of the
+corpus; tests/test_json_extraction.py checks every record individually:
+
+    python benchmarks/bench_json_extraction.py --min-success 1.0
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import timeit
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'llm_output_corpus.jsonl')
+
+
+def legacy_extract(text):
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        json_match = re.search(r'\{.*\}', text, re.DOTALL)
+        if json_match:
+            try:
+                return json.loads(json_match.group())
+            except json.JSONDecodeError:
+                pass
+    return None
+
+
+def is_success(result, expect_keys):
+    if expect_keys is None:
+        return result is None
+    return isinstance(result, dict) and all(key in result for key in expect_keys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--min-success', type=float, default=1.0, help='Required parse-success rate of the scanner.')
+    args = parser.parse_args()
+
+    with open(CORPUS, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+
+    extractors = [('legacy', legacy_extract), ('scanner', app.extract_json_from_text)]
+    print(f"{'record':<28} {'bytes':>6} " + ' '.join(f"{name:>16}" for name, _ in extractors))
+    passed = {name: 0 for name, _ in extractors}
+    for record in records:
+        cells = []
+        for name, extract in extractors:
+            ok = is_success(extract(record['output']), record['expect_keys'])
+            passed[name] += ok
+            seconds = min(timeit.repeat(lambda: extract(record['output']), number=200, repeat=3)) / 200
+            cells.append(f"{'ok' if ok else 'FAIL':>5} {seconds * 1e6:>8.1f} us")
+        print(f"{record['name']:<28} {len(record['output']):>6} " + ' '.join(cells))
+
+    print()
+    for name, _ in extractors:
+        print(f"{name}: {passed[name]}/{len(records)} parsed ({passed[name] / len(records):.0%})")
+
+    rate = passed['scanner'] / len(records)
+    if rate < args.min_success:
+        print(f"scanner success rate {rate:.0%} is below the required {args.min_success:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""/api/health latency while a burst of clients hammer /api/login.
+
+Runs the app on a local threaded server twice: with bcrypt inline on the
+request threads (PASSWORD_HASH_WORKERS=0, the old behaviour) and on the
+bounded password hashing pool:
+
+    python benchmarks/bench_login_storm.py --clients 16 --seconds 10 --workers 2
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.serving import make_server
+
+import app
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else float('nan')
+
+
+def request(port, method, path, body=None):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    try:
+        connection.request(method, path, body=json.dumps(body) if body else None, headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    finally:
+        connection.close()
+
+
+def storm(port, clients, seconds):
+    deadline = time.monotonic() + seconds
+    statuses = {}
+    health = []
+    lock = threading.Lock()
+
+    def login_client():
+        while time.monotonic() < deadline:
+            status = request(port, 'POST', '/api/login', {"email": "bench@example.com", "password": "correct horse"})
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+
+    def prober():
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            request(port, 'GET', '/api/health')
+            health.append(time.perf_counter() - started)
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=login_client) for _ in range(clients)] + [threading.Thread(target=prober)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return statuses, health
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent login loops.')
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--workers', type=int, default=app.app.config['PASSWORD_HASH_WORKERS'] or 2)
+    args = parser.parse_args()
+
+    with app.app.app_context():
+        app.db.create_all()
+        app.db.session.add(app.User(username='bench', email='bench@example.com', password_hash=app.password_hasher.hash('correct horse')))
+        app.db.session.commit()
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    print(f"bcrypt rounds {app.password_hasher.rounds}, {args.clients} login clients, {args.seconds:.0f}s per run")
+    print(f"{'mode':>14} {'logins/s':>9} {'503s':>6} {'health p50 ms':>14} {'health p99 ms':>14}")
+    for mode, workers in (('inline', 0), (f'pool({args.workers})', args.workers)):
+        app.password_hasher.workers = workers
+        statuses, health = storm(server.server_port, args.clients, args.seconds)
+        logins = statuses.get(200, 0)
+        print(f"{mode:>14} {logins / args.seconds:>9.1f} {statuses.get(503, 0):>6} "
+              f"{percentile(health, 0.5) * 1000:>14.1f} {percentile(health, 0.99) * 1000:>14.1f}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Hot-path cost of recording one request's metrics from several threads.
+
+Each "request" does what the request hooks do: in-flight +1/-1, one
+latency observation and one status counter. Compares the per-thread shard
+registry with the same operations behind a single shared lock:
+
+    python benchmarks/bench_metrics.py --threads 8
+"""
+import argparse
+import bisect
+import os
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+LABELS = (('route', '/api/generate-resume-from-prompt'), ('method', 'POST'))
+STATUS_LABELS = LABELS + (('status', '200'),)
+ROUTE_LABELS = (('route', '/api/generate-resume-from-prompt'),)
+
+
+class LockedRegistry:
+    def __init__(self):
+        self.values = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def inc(self, name, labels=(), amount=1):
+        with self.lock:
+            key = (name, labels)
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def observe(self, name, value, labels=()):
+        with self.lock:
+            counts = self.histograms.setdefault((name, labels), [0] * (len(app.HTTP_LATENCY_BUCKETS) + 2))
+            counts[bisect.bisect_left(app.HTTP_LATENCY_BUCKETS, value)] += 1
+            counts[-1] += value
+
+
+def record(registry, n):
+    for i in range(n):
+        registry.inc('http_requests_in_flight', ROUTE_LABELS)
+        registry.observe('http_request_duration_seconds', (i % 100) / 1000, LABELS)
+        registry.inc('http_requests_total', STATUS_LABELS)
+        registry.inc('http_requests_in_flight', ROUTE_LABELS, -1)
+
+
+def run(registry, threads, per_thread):
+    workers = [threading.Thread(target=record, args=(registry, per_thread)) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - started) / (threads * per_thread)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=50000, help='Requests recorded per thread.')
+    args = parser.parse_args()
+
+    sharded = app.MetricsRegistry()
+    sharded.histogram('http_request_duration_seconds', '', app.HTTP_LATENCY_BUCKETS)
+    for name, registry in (('single lock', LockedRegistry()), ('thread shards', sharded)):
+        seconds = min(run(registry, args.threads, args.requests) for _ in range(3))
+        print(f"{name:>14}: {seconds * 1e6:6.2f} us per request ({args.threads} threads)")
+
+    started = time.perf_counter()
+    body = sharded.render()
+    print(f"{'scrape':>14}: {(time.perf_counter() - started) * 1000:6.2f} ms, {len(body)} bytes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Prompt classification cost: legacy per-keyword scans vs the single tokenizing pass.
+
+The legacy path is what detect_content_type, generate_professional_title and
+create_enhanced_resume_from_data used to run on every prompt:
+
+    python benchmarks/bench_prompt_features.py
+"""
+import os
+import re
+import sys
+import tempfile
+import timeit
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+EDUCATION_KEYWORDS = ['bca', 'b.c.a', 'bachelor', 'college', 'university', 'student', 'graduated', 'degree', 'school', 'education', 'studied', 'course', 'academic']
+EXPERIENCE_KEYWORDS = ['worked', 'job', 'company', 'experience', 'years', 'intern', 'role', 'responsibilities', 'employed', 'professional', 'career', 'industry']
+TITLE_KEYWORDS = [
+    ['bca', 'computer', 'software', 'programming'],
+    ['engineering', 'engineer'],
+    ['business', 'management', 'mba'],
+    ['design', 'creative', 'art'],
+]
+
+
+def legacy_classify(prompt):
+    input_lower = prompt.lower()
+    education_score = sum(1 for keyword in EDUCATION_KEYWORDS if keyword in input_lower)
+    experience_score = sum(1 for keyword in EXPERIENCE_KEYWORDS if keyword in input_lower)
+    prompt_lower = prompt.lower()
+    title_group = next((i for i, words in enumerate(TITLE_KEYWORDS) if any(word in prompt_lower for word in words)), None)
+    flags = [re.search(pattern, prompt, re.IGNORECASE) for pattern in ('bca', 'medicaps', 'choithram')]
+    return education_score, experience_score, title_group, flags
+
+
+def single_pass_classify(prompt):
+    # Bypass the per-prompt cache so every call pays for a full scan
+    return app.extract_prompt_features.__wrapped__(prompt)
+
+
+BASE = ("I am a BCA student at Medicaps University (2024-2027) and completed 12th from Choithram School. "
+        "I built a library management project in Java and SQL, took part in the college hackathon, "
+        "and I am looking for an internship as a software developer where I can start contributing. ")
+
+
+def main():
+    print(f"{'prompt size':>12} {'legacy us':>10} {'single-pass us':>15} {'speedup':>8}")
+    for repeat in (1, 10, 100):
+        prompt = BASE * repeat
+        number = max(20, 2000 // repeat)
+        legacy = min(timeit.repeat(lambda: legacy_classify(prompt), number=number, repeat=5)) / number
+        single_pass = min(timeit.repeat(lambda: single_pass_classify(prompt), number=number, repeat=5)) / number
+        print(f"{len(prompt):>10} B {legacy * 1e6:>10.1f} {single_pass * 1e6:>15.1f} {legacy / single_pass:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Request-thread cost of logging one resume request.
+
+Compares the old print() of the form, raw LLM output and outgoing resume
+with the queued structured logger at several payload sample rates. Output
+goes to a temp file, once as is and once with every write delayed to mimic
+a stdout pipe whose reader has fallen behind. Only the time spent on the
+calling thread is measured; records the listener cannot keep up with are
+dropped and counted:
+
+    python benchmarks/bench_request_logging.py
+"""
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+from fake_groq_server import CANNED_RESUME
+
+FORM = {"fullName": "Test User", "email": "test@example.com", "phone": "+91 98765 43210", "location": "Indore",
+        "prompt": "BCA student at Medicaps University", "field": "Computer Science", "experienceLevel": "Student"}
+RAW_OUTPUT = json.dumps(CANNED_RESUME, indent=2)
+
+
+def legacy_request(resume):
+    print("📨 RECEIVED DATA FROM FRONTEND:", FORM)
+    print(f"🔍 Using basic info - Name: {FORM.get('fullName', '')}, Email: {FORM.get('email', '')}, Phone: {FORM.get('phone', '')}, Location: {FORM.get('location', '')}")
+    print(f"🔍 Detected content type: {app.detect_content_type(FORM.get('prompt', ''))}")
+    print("Sending enhanced prompt to AI...")
+    print("AI Raw Output:", RAW_OUTPUT)
+    print("✅ AI returned valid JSON")
+    print("📤 SENDING ENHANCED DATA TO FRONTEND:", resume)
+
+
+def structured_request(response):
+    app.payload_sampled_var.set(app.random.random() < app.app.config['LOG_PAYLOAD_SAMPLE_RATE'])
+    if app.payload_sampled_var.get():
+        app.log_payload("Resume request", form=FORM, content_type=app.detect_content_type(FORM.get('prompt', '')))
+    app.log_payload("AI raw output", output=RAW_OUTPUT)
+    if app.payload_sampled_var.get():
+        app.log_payload("Resume response", resume=response.get_data(as_text=True))
+    app.log_event("request", method="POST", path="/api/generate-resume-from-prompt", status=200, duration_ms=1.0,
+                  stages={"parse": 0.1, "prompt": 0.1, "llm": 900.0, "extract": 0.1, "postprocess": 0.3, "serialize": 0.1})
+
+
+class Sink:
+    def __init__(self, f, delay):
+        self.f = f
+        self.delay = delay
+
+    def write(self, text):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.f.write(text)
+
+    def flush(self):
+        self.f.flush()
+
+
+def drain():
+    while not app.log_handler.queue.empty():
+        time.sleep(0.01)
+
+
+def measure(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main():
+    with app.app.app_context():
+        resume = app.ResumeData.from_dict(json.loads(RAW_OUTPUT), FORM)
+        response = app.resume_response(resume)
+
+    print(f"{'stdout':>14} {'logging':>22} {'us/request':>11} {'dropped':>8}")
+    with tempfile.TemporaryFile('w', encoding='utf-8') as f:
+        for sink_name, delay, number in (('file', 0, 2000), ('slow pipe', 0.0005, 100)):
+            sink = Sink(f, delay)
+            with contextlib.redirect_stdout(sink):
+                legacy = measure(lambda: legacy_request(resume), number)
+            print(f"{sink_name:>14} {'print() payloads':>22} {legacy * 1e6:>11.1f} {'-':>8}")
+            app.log_output.setStream(sink)
+            for rate in (0.0, 0.01, 1.0):
+                app.app.config['LOG_PAYLOAD_SAMPLE_RATE'] = rate
+                drain()
+                dropped = app.log_handler.dropped
+                seconds = measure(lambda: structured_request(response), number)
+                print(f"{sink_name:>14} {'structured, sample ' + format(rate, 'g'):>22} {seconds * 1e6:>11.1f} "
+                      f"{app.log_handler.dropped - dropped:>8}")
+                drain()
+            app.log_output.setStream(sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Per-request CPU for post-processing and serializing an LLM resume.
+
+Compares the old path (in-place dict fixes + jsonify) with the typed
+ResumeData model (one validation pass + encode_json), with and without
+orjson, on a small and a large resume. "miss" starts from the raw LLM
+text, "hit" from an already post-processed cache entry:
+
+    python benchmarks/bench_resume_model.py
+"""
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+from fake_groq_server import CANNED_RESUME
+
+FORM = {"fullName": "Test User", "email": "test@example.com", "prompt": "BCA student at Medicaps University",
+        "field": "Computer Science", "experienceLevel": "Student"}
+
+
+def legacy_postprocess(resume_data, data):
+    for section, value in list(resume_data.items()):
+        if section in app.RESUME_BASIC_INFO_DEFAULTS:
+            resume_data[section] = data.get(section) or value or app.RESUME_BASIC_INFO_DEFAULTS[section]
+        elif section == 'skills' and isinstance(value, list):
+            skills = app.canonicalize_skills(value)
+            if len(skills) < 8:
+                skills += app.get_recommended_skills(data.get('field') or data.get('stream', ''), data.get('experienceLevel', ''), skills)[:5]
+            resume_data[section] = skills
+        elif section == 'summary' and isinstance(value, str):
+            resume_data[section] = app.validate_summary_length(value)
+    if 'jobTitle' not in resume_data:
+        resume_data['jobTitle'] = app.generate_professional_title(data.get('prompt', ''), data.get('field', ''), data.get('experienceLevel', ''))
+    if 'languages' not in resume_data:
+        resume_data['languages'] = [dict(language) for language in app.DEFAULT_RESUME_LANGUAGES]
+    return resume_data
+
+
+def legacy_request(raw):
+    return app.jsonify({"resumeData": legacy_postprocess(json.loads(raw), FORM)}).get_data()
+
+
+def typed_request(raw):
+    return app.resume_response(app.ResumeData.from_dict(json.loads(raw), FORM)).get_data()
+
+
+def legacy_hit(cached):
+    return app.jsonify({"resumeData": cached}).get_data()
+
+
+def typed_hit(cached):
+    return app.resume_response(app.ResumeData.from_cache(cached)).get_data()
+
+
+def large_resume():
+    resume = dict(CANNED_RESUME)
+    resume['skills'] = [skill for category in app.SKILLS_DATABASE.values() for skill in category][:60]
+    resume['projects'] = [{"title": f"Project {i}", "description": "Built and shipped a feature end to end. " * 8,
+                           "technologies": ["Python", "Flask", "React", "PostgreSQL", "Docker", "Redis", "AWS", "Git"]}
+                          for i in range(30)]
+    resume['workExperience'] = [{"id": i, "company": f"Company {i}", "position": "Software Engineer", "startDate": "2020",
+                                 "endDate": "2022", "description": "Owned services and mentored engineers. " * 10}
+                                for i in range(1, 21)]
+    resume['achievements'] = [f"Achievement number {i}" for i in range(40)]
+    return resume
+
+
+def main():
+    encoder = app.orjson
+    print(f"{'resume':>12} {'bytes':>7} {'legacy us':>10} {'typed+stdlib us':>16} {'typed+orjson us':>16}")
+    with app.app.app_context():
+        for name, resume in (('small', CANNED_RESUME), ('large', large_resume())):
+            raw = json.dumps(resume)
+            cached = app.ResumeData.from_dict(json.loads(raw), FORM).to_dict()
+            number = 2000 if name == 'small' else 200
+            for path, legacy_fn, typed_fn, arg in (('miss', legacy_request, typed_request, raw), ('hit', legacy_hit, typed_hit, cached)):
+                legacy = min(timeit.repeat(lambda: legacy_fn(arg), number=number, repeat=5)) / number
+                app.orjson = None
+                stdlib = min(timeit.repeat(lambda: typed_fn(arg), number=number, repeat=5)) / number
+                app.orjson = encoder
+                fast = min(timeit.repeat(lambda: typed_fn(arg), number=number, repeat=5)) / number if encoder else float('nan')
+                print(f"{name + ' ' + path:>12} {len(raw):>7} {legacy * 1e6:>10.1f} {stdlib * 1e6:>16.1f} {fast * 1e6:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Throughput of get_recommended_skills against the original implementation.
+
+    python benchmarks/bench_skill_recommendations.py
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import SKILLS_DATABASE, get_recommended_skills
+
+
+def legacy_get_recommended_skills(field, experience_level, current_skills=[]):
+    """The list-scanning implementation this benchmark compares against"""
+    recommended = []
+    field_lower = field.lower() if field else ''
+    if any(word in field_lower for word in ['computer', 'software', 'bca', 'engineering', 'technology']):
+        recommended.extend(SKILLS_DATABASE['technical'][:15])
+        recommended.extend(SKILLS_DATABASE['soft_skills'][:10])
+    elif any(word in field_lower for word in ['business', 'management', 'commerce', 'mba']):
+        recommended.extend(SKILLS_DATABASE['business'][:15])
+        recommended.extend(SKILLS_DATABASE['soft_skills'][:10])
+    elif any(word in field_lower for word in ['design', 'art', 'creative', 'media']):
+        recommended.extend(SKILLS_DATABASE['creative'][:15])
+        recommended.extend(SKILLS_DATABASE['soft_skills'][:10])
+    else:
+        recommended.extend(SKILLS_DATABASE['soft_skills'][:15])
+        recommended.extend(['Microsoft Office', 'Communication', 'Problem Solving', 'Teamwork'])
+    if experience_level == 'Student':
+        recommended.extend(['Academic Research', 'Team Projects', 'Time Management', 'Learning Agility'])
+    elif experience_level == 'Fresher':
+        recommended.extend(['Quick Learning', 'Adaptability', 'Entry-Level Expertise', 'Professional Development'])
+    recommended = [skill for skill in recommended if skill not in current_skills]
+    return list(dict.fromkeys(recommended))[:20]
+
+
+SHORT_CASES = [
+    ('Computer Science', 'Student', ['Python', 'Java', 'SQL']),
+    ('MBA', 'Fresher', ['Leadership']),
+    ('Graphic Design and Media', 'Experienced', []),
+    ('Biology', '', ['Communication']),
+]
+# Long current-skill lists are where the per-candidate list scan hurts
+LONG_SKILLS = [skill for skills in SKILLS_DATABASE.values() for skill in skills][:150]
+LONG_CASES = [(field, level, LONG_SKILLS) for field, level, _ in SHORT_CASES]
+
+
+def run(function, cases, number):
+    def batch():
+        for field, level, skills in cases:
+            function(field, level, skills)
+    seconds = min(timeit.repeat(batch, number=number, repeat=5))
+    return number * len(cases) / seconds
+
+
+def main(number=2000):
+    print(f"{'current skills':<16} {'legacy calls/s':>15} {'indexed calls/s':>16} {'speedup':>8}")
+    for label, cases in [('0-3', SHORT_CASES), ('150', LONG_CASES)]:
+        legacy = run(legacy_get_recommended_skills, cases, number)
+        indexed = run(get_recommended_skills, cases, number)
+        print(f"{label:<16} {legacy:>15,.0f} {indexed:>16,.0f} {indexed / legacy:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
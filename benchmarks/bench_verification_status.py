@@ -0,0 +1,78 @@
+"""Latency of /api/get-skill-verification-status from 1 to 500 skills per request.
+
+Runs against a throwaway SQLite database seeded with many users, so the
+composite index has to do the work:
+
+    python benchmarks/bench_verification_status.py
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jwt
+from sqlalchemy import event
+
+from app import app, db, User, SkillVerification, SKILLS_DATABASE
+
+USERS = 200
+LEVELS = ['basic', 'intermediate', 'advanced']
+SIZES = [1, 10, 50, 100, 250, 500]
+REPEAT = 50
+
+
+def seed():
+    skills = list(dict.fromkeys(skill for group in SKILLS_DATABASE.values() for skill in group))
+    # Pad the catalog so the largest request asks for 500 distinct skills
+    skills += [f"Skill {i}" for i in range(max(0, 500 - len(skills)))]
+    now = datetime.utcnow()
+    db.create_all()
+    users = [User(username=f"user{i}", email=f"user{i}@example.com", password_hash='x') for i in range(USERS)]
+    db.session.add_all(users)
+    db.session.flush()
+    rows = [
+        {"user_id": user.id, "skill": skill, "level": level, "attempts": 1, "last_attempt": now, "is_verified": level == 'basic'}
+        for user in users for skill in skills[:500] for level in LEVELS
+    ]
+    db.session.execute(SkillVerification.__table__.insert(), rows)
+    db.session.commit()
+    return users[0].id, skills[:500]
+
+
+def main():
+    with app.app_context():
+        user_id, skills = seed()
+        statements = []
+        event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+    token = jwt.encode({'user_id': user_id, 'exp': datetime.utcnow() + timedelta(hours=1)}, app.config['SECRET_KEY'], algorithm="HS256")
+    headers = {'Authorization': f"Bearer {token}"}
+    client = app.test_client()
+
+    print(f"{'skills':>7} {'median ms':>10} {'p95 ms':>8} {'queries':>8} {'304 median ms':>14}")
+    for size in SIZES:
+        body = {'skills': skills[:size]}
+        timings, conditional = [], []
+        statements.clear()
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            response = client.post('/api/get-skill-verification-status', json=body, headers=headers)
+            timings.append(time.perf_counter() - start)
+        queries = len(statements) / REPEAT
+        etag = response.headers['ETag']
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            client.post('/api/get-skill-verification-status', json=body, headers=dict(headers, **{'If-None-Match': etag}))
+            conditional.append(time.perf_counter() - start)
+        timings.sort()
+        conditional.sort()
+        print(f"{size:>7} {timings[REPEAT // 2] * 1000:>10.2f} {timings[int(REPEAT * 0.95)] * 1000:>8.2f} "
+              f"{queries:>8.1f} {conditional[REPEAT // 2] * 1000:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
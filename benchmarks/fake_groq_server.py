@@ -0,0 +1,178 @@
+"""Local stand-in for the Groq chat completions API.
+
+Serves POST /openai/v1/chat/completions with canned answers so the app can
+be exercised without spending Groq quota:
+
+    python benchmarks/fake_groq_server.py --port 8088 --latency 0.5 --jitter 0.2 --error-rate 0.1 --malformed-rate 0.2
+    GROQ_BASE_URL=http://127.0.0.1:8088 GROQ_API_KEY=fake flask --app app run
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANNED_QUESTION = {
+    "question": "Which statement about this skill is correct?",
+    "options": {"A": "First option", "B": "Second option", "C": "Third option", "D": "Fourth option"},
+    "correct_answer": "A",
+    "explanation": "The first option is the canned correct answer."
+}
+
+CANNED_RESUME = {
+    "fullName": "Test User",
+    "email": "test@example.com",
+    "phone": "+1 234 567 8900",
+    "location": "Indore",
+    "jobTitle": "Aspiring Software Developer",
+    "summary": "Motivated computer applications student with hands-on experience building web applications.",
+    "education": [{"id": 1, "degree": "BCA", "school": "Medicaps University", "year": "2024-2027", "score": "Pursuing"}],
+    "skills": ["Python", "Java", "SQL"],
+    "projects": [{"title": "Portfolio Site", "description": "Personal portfolio built with React", "technologies": ["React"]}],
+    "workExperience": [],
+    "internships": [],
+    "extraCurricular": [],
+    "languages": [{"language": "English", "proficiency": "Fluent"}],
+    "certifications": [],
+    "achievements": []
+}
+
+
+def malformed_outputs(canned):
+    """The ways real LLM answers break: prose around the JSON, code fences,
+    a trailing comma, smart quotes, and a truncated (unrecoverable) answer"""
+    text = json.dumps(canned, indent=2)
+    return [
+        f"Here is the JSON you asked for:\n{text}\nLet me know if you need any changes.",
+        f"```json\n{text}\n```",
+        text[:-2] + ",\n}",
+        re.sub(r'": "([^"\n]*)"', '": \u201c\\1\u201d', text),
+        text[:len(text) // 2],
+    ]
+
+
+MALFORMED_QUESTIONS = malformed_outputs(CANNED_QUESTION)
+MALFORMED_RESUMES = malformed_outputs(CANNED_RESUME)
+
+
+class FakeGroqHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_stream(self, request, content, chunk_size=40):
+        """Answer as server-sent chat.completion.chunk events"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        for i in range(0, len(content), chunk_size):
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get('model', 'fake'),
+                "choices": [{"index": 0, "delta": {"content": content[i:i + chunk_size]}, "finish_reason": None}]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+            if self.server.settings['chunk_delay']:
+                time.sleep(self.server.settings['chunk_delay'])
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        settings = self.server.settings
+        self.server.record_request()
+
+        latency = settings['latency'] + random.uniform(-settings['jitter'], settings['jitter'])
+        if latency > 0:
+            time.sleep(latency)
+        if self.server.take_failure() or random.random() < settings['error_rate']:
+            return self.send_json(settings['error_status'], {"error": {"message": "Injected failure"}})
+        if not self.path.endswith('/chat/completions'):
+            return self.send_json(404, {"error": {"message": "Not found"}})
+
+        prompt = request['messages'][-1]['content']
+        is_question = 'multiple-choice question' in prompt
+        if random.random() < settings['malformed_rate']:
+            content = random.choice(MALFORMED_QUESTIONS if is_question else MALFORMED_RESUMES)
+        else:
+            content = json.dumps(CANNED_QUESTION if is_question else CANNED_RESUME)
+        if request.get('stream'):
+            return self.send_stream(request, content)
+        self.send_json(200, {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get('model', 'fake'),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": 200, "total_tokens": len(prompt.split()) + 200}
+        })
+
+
+class FakeGroqServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, latency=0.0, error_rate=0.0, error_status=503, chunk_delay=0.0, jitter=0.0, malformed_rate=0.0):
+        super().__init__(('127.0.0.1', port), FakeGroqHandler)
+        self.settings = {
+            "latency": latency, "jitter": jitter, "error_rate": error_rate, "error_status": error_status,
+            "chunk_delay": chunk_delay, "malformed_rate": malformed_rate
+        }
+        self.requests = 0
+        # Requests that fail before error_rate applies, for deterministic retry tests
+        self.fail_next = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def take_failure(self):
+        with self._lock:
+            if self.fail_next <= 0:
+                return False
+            self.fail_next -= 1
+            return True
+
+    def start(self):
+        """Serve from a daemon thread; returns self for convenience"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8088)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds to wait before answering.')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Latency varies uniformly by up to this many seconds.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests that fail.')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--chunk-delay', type=float, default=0.0, help='Seconds between streamed chunks.')
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help='Fraction of answers that are not clean JSON.')
+    args = parser.parse_args()
+    server = FakeGroqServer(args.port, args.latency, args.error_rate, args.error_status, args.chunk_delay,
+                            args.jitter, args.malformed_rate)
+    print(f"Fake Groq API on {server.base_url}")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
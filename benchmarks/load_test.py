@@ -0,0 +1,180 @@
+"""Load scenarios for the main routes against a local fake Groq server.
+
+Starts fake_groq_server.py and the app on local threaded servers, then runs
+each scenario with a fixed number of closed-loop clients for a fixed time:
+
+    python benchmarks/load_test.py --clients 8 --seconds 10 --latency 0.3 --malformed-rate 0.1
+    python benchmarks/load_test.py --scenarios login --baseline load-results.json
+
+Scenarios:
+  generate-resume          a new prompt every request (cache miss, LLM call)
+  generate-resume-cached   the same prompt every request (cache hit)
+  generate-skill-question  40 skills in rotation, so the question pools fill up
+  login                    valid credentials (bcrypt verify)
+  skill-recommendations    recommendations for a few fields and levels
+"""
+import argparse
+import http.client
+import itertools
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import results
+from fake_groq_server import FakeGroqServer
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "React", "SQL", "Docker", "AWS", "Git", "Linux", "C++",
+    "Node.js", "TypeScript", "Django", "Flask", "PostgreSQL", "MongoDB", "Kubernetes", "Go", "Rust", "Kotlin",
+    "Swift", "Figma", "Excel", "Tableau", "Pandas", "NumPy", "TensorFlow", "PyTorch", "Spark", "Hadoop",
+    "Redis", "GraphQL", "HTML", "CSS", "Angular", "Vue", "Spring Boot", "Terraform", "Jenkins", "Power BI",
+]
+FIELDS = [("Computer Science", "Student"), ("Data Science", "Mid-level"), ("Design", "Fresher"), ("Business", "Senior")]
+LOGIN = {"email": "load@example.com", "password": "correct horse battery"}
+
+
+def resume_form(i):
+    return {"fullName": "Load Test", "email": "load@example.com", "location": "Indore", "field": "Computer Science",
+            "experienceLevel": "Student", "prompt": f"BCA student at Medicaps University, built project number {i}"}
+
+
+SCENARIOS = {
+    "generate-resume": lambda i: ('/api/generate-resume-from-prompt', resume_form(i)),
+    "generate-resume-cached": lambda i: ('/api/generate-resume-from-prompt', resume_form(0)),
+    "generate-skill-question": lambda i: ('/api/generate-skill-question',
+                                          {"skill": SKILLS[i % len(SKILLS)], "level": "basic", "difficulty": "basic"}),
+    "login": lambda i: ('/api/login', LOGIN),
+    "skill-recommendations": lambda i: ('/api/skill-recommendations',
+                                        {"field": FIELDS[i % len(FIELDS)][0], "experienceLevel": FIELDS[i % len(FIELDS)][1],
+                                         "currentSkills": ["Python", "SQL"]}),
+}
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else float('nan')
+
+
+def post(port, path, body):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+    try:
+        connection.request('POST', path, body=json.dumps(body), headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    except (OSError, http.client.HTTPException):
+        return 'connection-error'
+    finally:
+        connection.close()
+
+
+def run_scenario(port, make_request, clients, seconds):
+    counter = itertools.count()
+    deadline = time.monotonic() + seconds
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+
+    def client():
+        while time.monotonic() < deadline:
+            path, body = make_request(next(counter))
+            started = time.perf_counter()
+            status = post(port, path, body)
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    errors = sum(count for status, count in statuses.items() if not status.startswith(('2', '4')))
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / wall, 2),
+        "latency_ms": {name: round(percentile(latencies, fraction) * 1000, 2)
+                       for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))},
+        "statuses": statuses,
+        "error_rate": round(errors / len(latencies), 4) if latencies else 0.0,
+    }
+
+
+def counter_value(app, name, labels=()):
+    return app.metrics.snapshot().values.get((name, labels), 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='Comma-separated scenario names.')
+    parser.add_argument('--clients', type=int, default=8, help='Concurrent clients per scenario.')
+    parser.add_argument('--seconds', type=float, default=10.0, help='Duration of each scenario.')
+    parser.add_argument('--latency', type=float, default=0.3, help='Fake LLM latency in seconds.')
+    parser.add_argument('--jitter', type=float, default=0.1, help='Fake LLM latency varies by up to this many seconds.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of fake LLM calls that fail.')
+    parser.add_argument('--malformed-rate', type=float, default=0.1, help='Fraction of fake LLM answers that are not clean JSON.')
+    parser.add_argument('--bcrypt-rounds', type=int, help='BCRYPT_LOG_ROUNDS for the login scenario (default: app config).')
+    results.add_arguments(parser, 'load-results.json')
+    args = parser.parse_args()
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    fake = FakeGroqServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                          malformed_rate=args.malformed_rate).start()
+    # The app reads these at import time
+    os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'load.db'))
+    os.environ['GROQ_BASE_URL'] = fake.base_url
+    os.environ['GROQ_API_KEY'] = 'fake'
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    if args.bcrypt_rounds:
+        os.environ['BCRYPT_LOG_ROUNDS'] = str(args.bcrypt_rounds)
+
+    import app
+    from werkzeug.serving import make_server
+
+    with app.app.app_context():
+        app.db.create_all()
+        if not app.User.query.filter_by(email=LOGIN['email']).first():
+            app.db.session.add(app.User(username='load', email=LOGIN['email'], password_hash=app.password_hasher.hash(LOGIN['password'])))
+            app.db.session.commit()
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    details = {}
+    metrics = {}
+    print(f"{'scenario':<25} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'errors':>7} {'LLM calls':>10} {'fallbacks':>10}")
+    for name in scenarios:
+        llm_calls = fake.requests
+        fallbacks = counter_value(app, 'resume_fallbacks_total')
+        result = run_scenario(server.server_port, SCENARIOS[name], args.clients, args.seconds)
+        result["llm_calls"] = fake.requests - llm_calls
+        result["resume_fallbacks"] = counter_value(app, 'resume_fallbacks_total') - fallbacks
+        details[name] = result
+        latency = result["latency_ms"]
+        metrics[f"{name}.p50_ms"] = latency["p50"]
+        metrics[f"{name}.p99_ms"] = latency["p99"]
+        print(f"{name:<25} {result['throughput_rps']:>8.1f} {latency['p50']:>8.1f} {latency['p90']:>8.1f} {latency['p99']:>8.1f} "
+              f"{result['error_rate']:>7.1%} {result['llm_calls']:>10} {result['resume_fallbacks']:>10}")
+    server.shutdown()
+    fake.shutdown()
+
+    settings = {key: value for key, value in vars(args).items() if key not in ('output', 'baseline', 'threshold')}
+    settings["bcrypt_rounds"] = app.password_hasher.rounds
+    sys.exit(results.finish(args, 'load', settings, details, metrics))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Microbenchmarks for the per-request helpers in app.py.
+
+"cold" clears the function's lru caches before every call, so it measures
+a first sight of the input (the cache_clear calls are included in the
+time); "warm" is a repeated input served from the caches. The
+extract_json_from_text case times one pass over llm_output_corpus.jsonl:
+
+    python benchmarks/microbench.py --output micro.json
+    python benchmarks/microbench.py --baseline micro.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+import results
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'llm_output_corpus.jsonl')
+
+PROMPTS = {
+    "short": "BCA student at Medicaps University",
+    "medium": ("I am a BCA student at Medicaps University (2024-2027) and completed 12th from Choithram School. "
+               "I built a library management project in Java and SQL and took part in the college hackathon."),
+    "long": ("Software engineer with 6 years of experience at two product companies. I worked on payments, "
+             "led a team of four, and my responsibilities included system design and hiring. " * 20),
+}
+
+RECOMMENDATION_INPUTS = {
+    "student": ("Computer Science", "Student", ["Python", "Java", "SQL"]),
+    "senior": ("Data Science and Machine Learning", "Senior", ["Python", "TensorFlow", "Pandas", "SQL", "Docker", "AWS"]),
+}
+
+SUMMARIES = {
+    "short": "Motivated computer applications student with hands-on experience building web applications.",
+    "long": "Experienced engineer who designs, builds and operates reliable backend services at scale. " * 8,
+}
+
+
+def clear_prompt_caches():
+    app.extract_prompt_features.cache_clear()
+
+
+def clear_skill_caches():
+    app.match_field_groups.cache_clear()
+    app.ranked_skill_candidates.cache_clear()
+    app.canonical_skill.cache_clear()
+
+
+def cases():
+    """(name, fn, clear): clear is None for functions without caches"""
+    with open(CORPUS, encoding='utf-8') as f:
+        outputs = [json.loads(line)['output'] for line in f if line.strip()]
+    yield 'extract_json_from_text.corpus', lambda: [app.extract_json_from_text(output) for output in outputs], None
+    for size, prompt in PROMPTS.items():
+        yield f'detect_content_type.{size}', lambda prompt=prompt: app.detect_content_type(prompt), clear_prompt_caches
+    for name, (field, level, skills) in RECOMMENDATION_INPUTS.items():
+        yield (f'get_recommended_skills.{name}', lambda field=field, level=level, skills=skills:
+               app.get_recommended_skills(field, level, skills), clear_skill_caches)
+    for size, summary in SUMMARIES.items():
+        yield f'validate_summary_length.{size}', lambda summary=summary: app.validate_summary_length(summary), None
+
+
+def measure(fn, number, repeat):
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=500, help='Calls per timing.')
+    parser.add_argument('--repeat', type=int, default=5, help='Timings per case; the fastest is kept.')
+    results.add_arguments(parser, 'microbench-results.json')
+    args = parser.parse_args()
+
+    metrics = {}
+    print(f"{'case':<40} {'cold us':>10} {'warm us':>10}")
+    for name, fn, clear in cases():
+        number = max(1, args.number // 20) if name.startswith('extract_json') else args.number
+        if clear is None:
+            metrics[f'{name}.us'] = measure(fn, number, args.repeat) * 1e6
+            print(f"{name:<40} {metrics[f'{name}.us']:>10.2f} {'-':>10}")
+            continue
+        metrics[f'{name}.cold_us'] = measure(lambda: (clear(), fn()), number, args.repeat) * 1e6
+        fn()
+        metrics[f'{name}.warm_us'] = measure(fn, number, args.repeat) * 1e6
+        print(f"{name:<40} {metrics[f'{name}.cold_us']:>10.2f} {metrics[f'{name}.warm_us']:>10.2f}")
+
+    settings = {"number": args.number, "repeat": args.repeat}
+    sys.exit(results.finish(args, 'microbench', settings, {}, {name: round(value, 3) for name, value in metrics.items()}))
+
+
+if __name__ == '__main__':
+    main()
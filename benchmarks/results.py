@@ -0,0 +1,65 @@
+"""JSON result files for load_test.py and microbench.py.
+
+Every run writes its settings, the environment it ran in and a flat
+{"metric": value} map where lower is better. Passing a previous result as
+--baseline prints the metrics that got slower than --threshold and makes
+the script exit with status 1, so runs can gate a CI job.
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+
+def add_arguments(parser, default_output):
+    parser.add_argument('--output', default=default_output, help='Where to write the JSON results.')
+    parser.add_argument('--baseline', help='Earlier results to compare against.')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed slowdown before a metric is a regression.')
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(baseline, metrics, threshold):
+    """[(metric, baseline value, current value)] for metrics more than threshold slower"""
+    regressions = []
+    for name, value in metrics.items():
+        previous = baseline.get('metrics', {}).get(name)
+        if previous and value > previous * (1 + threshold):
+            regressions.append((name, previous, value))
+    return regressions
+
+
+def finish(args, kind, settings, details, metrics):
+    """Write the results file, compare with --baseline and return the exit status"""
+    results = {"kind": kind, "environment": environment(), "settings": settings, "details": details, "metrics": metrics}
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(baseline, metrics, args.threshold)
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+        return 0
+    print(f"Regressions beyond {args.threshold:.0%} against {args.baseline}:")
+    for name, previous, value in regressions:
+        print(f"  {name}: {previous:.2f} -> {value:.2f} ({value / previous - 1:+.0%})")
+    return 1
@@ -0,0 +1,12 @@
+"""Shared setup: app.py reads its configuration at import, so the environment is set first.
+
+    pip install -r requirements-dev.txt
+    python -m pytest
+"""
+import os
+import sys
+import tempfile
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'test.db'))
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
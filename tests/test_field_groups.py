@@ -0,0 +1,40 @@
+"""match_field_groups: which SKILLS_DATABASE groups a free-text field belongs to"""
+import pytest
+
+import app
+
+
+@pytest.mark.parametrize('field, groups', [
+    ('Computer Science', ('technical',)),
+    ('Computers', ('technical',)),
+    ('Computer Engineering', ('technical',)),
+    ('Software Development', ('technical',)),
+    ('BCA', ('technical',)),
+    ('Mechanical Engineering', ('technical',)),
+    ('Bioengineering', ('technical',)),
+    ('Information Technology', ('technical',)),
+    ('Information Technologies', ('technical',)),
+    ('Biotechnology', ('technical',)),
+    ('Business Administration', ('business',)),
+    ('Agribusiness', ('business',)),
+    ('Hotel Management', ('business',)),
+    ('E-Commerce', ('business',)),
+    ('MBA', ('business',)),
+    ('Graphic Design', ('creative',)),
+    ('Fashion Designing', ('creative',)),
+    ('Fine Arts', ('creative',)),
+    ('Creative Writing', ('creative',)),
+    ('Multimedia', ('creative',)),
+    ('Mass Media', ('creative',)),
+    ('Technology Management', ('business', 'technical')),
+    ('Design Engineering', ('creative', 'technical')),
+])
+def test_fields_map_to_their_groups(field, groups):
+    app.match_field_groups.cache_clear()
+    assert app.match_field_groups(field) == groups
+
+
+@pytest.mark.parametrize('field', ['Department of Physics', 'Smart Cities', 'Intermediate', 'Mumbai', 'Start-up Studies', ''])
+def test_keywords_inside_other_words_do_not_match(field):
+    app.match_field_groups.cache_clear()
+    assert app.match_field_groups(field) == ()
@@ -0,0 +1,32 @@
+"""extract_json_from_text against the recorded LLM outputs in benchmarks/llm_output_corpus.jsonl"""
+import json
+import os
+
+import pytest
+
+import app
+
+CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'llm_output_corpus.jsonl')
+
+with open(CORPUS, encoding='utf-8') as f:
+    RECORDS = [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.mark.parametrize('record', RECORDS, ids=[record['name'] for record in RECORDS])
+def test_corpus_record(record):
+    result = app.extract_json_from_text(record['output'])
+    if record['expect_keys'] is None:
+        assert result is None
+    else:
+        assert isinstance(result, dict)
+        assert set(record['expect_keys']) <= set(result)
+
+
+def test_clean_output_round_trips():
+    record = next(record for record in RECORDS if record['name'] == 'clean_resume')
+    assert app.extract_json_from_text(record['output']) == json.loads(record['output'])
+
+
+def test_fenced_output_matches_unfenced():
+    payload = {"question": "Q?", "options": {"A": "a", "B": "b"}, "correct_answer": "A"}
+    assert app.extract_json_from_text(f"Here you go:\n```json\n{json.dumps(payload)}\n```\nGood luck!") == payload
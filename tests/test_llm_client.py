@@ -0,0 +1,123 @@
+"""LLMClient retries, circuit breaker and the resume fallback against benchmarks/fake_groq_server.py"""
+import os
+import sys
+import time
+
+import pytest
+
+import app
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from fake_groq_server import FakeGroqServer
+
+MESSAGES = [{"role": "user", "content": "Generate a multiple-choice question to test Python"}]
+
+
+@pytest.fixture(scope='module')
+def server():
+    server = FakeGroqServer().start()
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def fake(server):
+    server.settings.update(error_rate=0.0, error_status=503)
+    server.fail_next = 0
+    server.requests = 0
+    return server
+
+
+def make_client(server, max_retries=2, failure_threshold=5, reset_timeout=30.0):
+    return app.LLMClient(api_key='fake', base_url=server.base_url, timeout=5.0, max_retries=max_retries, backoff=0.0,
+                         breaker=app.CircuitBreaker(failure_threshold, reset_timeout))
+
+
+def complete(client):
+    return client.create(messages=MESSAGES, model=app.LLM_MODEL, temperature=0.7, max_tokens=50)
+
+
+def test_success_makes_one_request(fake):
+    client = make_client(fake)
+    assert app.extract_json_from_text(complete(client).choices[0].message.content)['correct_answer'] == 'A'
+    assert fake.requests == 1
+    assert client.breaker.state == 'closed'
+
+
+@pytest.mark.parametrize('status', [429, 500, 503])
+def test_retryable_errors_are_retried(fake, status):
+    fake.settings['error_status'] = status
+    fake.fail_next = 2
+    client = make_client(fake, max_retries=2)
+    complete(client)
+    assert fake.requests == 3
+    assert client.breaker.state == 'closed'
+
+
+def test_gives_up_after_max_retries(fake):
+    fake.settings['error_rate'] = 1.0
+    client = make_client(fake, max_retries=2)
+    with pytest.raises(app.LLMUnavailableError):
+        complete(client)
+    assert fake.requests == 3
+
+
+def test_client_errors_are_not_retried(fake):
+    fake.settings.update(error_rate=1.0, error_status=400)
+    client = make_client(fake, failure_threshold=1)
+    with pytest.raises(Exception) as raised:
+        complete(client)
+    assert not isinstance(raised.value, app.LLMUnavailableError)
+    assert fake.requests == 1
+    # A bad request says nothing about provider health
+    assert client.breaker.state == 'closed'
+
+
+def test_breaker_opens_then_half_opens_and_closes(fake):
+    fake.settings['error_rate'] = 1.0
+    client = make_client(fake, max_retries=0, failure_threshold=2, reset_timeout=0.2)
+    for _ in range(2):
+        with pytest.raises(app.LLMUnavailableError):
+            complete(client)
+    assert client.breaker.state == 'open'
+
+    # Open: calls fail fast without reaching the provider
+    with pytest.raises(app.LLMUnavailableError, match='circuit breaker is open'):
+        complete(client)
+    assert fake.requests == 2
+
+    time.sleep(0.25)
+    assert client.breaker.state == 'half-open'
+    fake.settings['error_rate'] = 0.0
+    complete(client)
+    assert fake.requests == 3
+    assert client.breaker.state == 'closed'
+
+
+def test_failed_trial_call_reopens_the_breaker(fake):
+    fake.settings['error_rate'] = 1.0
+    client = make_client(fake, max_retries=0, failure_threshold=1, reset_timeout=0.2)
+    with pytest.raises(app.LLMUnavailableError):
+        complete(client)
+    time.sleep(0.25)
+    assert client.breaker.state == 'half-open'
+    with pytest.raises(app.LLMUnavailableError):
+        complete(client)
+    assert client.breaker.state == 'open'
+    assert fake.requests == 2
+
+
+def test_resume_falls_back_when_the_provider_is_down(fake, monkeypatch):
+    fake.settings['error_rate'] = 1.0
+    monkeypatch.setattr(app, 'llm_client', make_client(fake, max_retries=1))
+    fallbacks = app.metrics.snapshot().values.get(('resume_fallbacks_total', ()), 0)
+
+    response = app.app.test_client().post('/api/generate-resume-from-prompt', headers={'Cache-Control': 'no-store'}, json={
+        "fullName": "Test User", "email": "test@example.com", "prompt": "BCA student at Medicaps University",
+        "field": "Computer Science", "experienceLevel": "Student"
+    })
+
+    assert response.status_code == 200
+    assert response.get_json()['resumeData']['fullName'] == 'Test User'
+    assert fake.requests == 2
+    assert app.metrics.snapshot().values.get(('resume_fallbacks_total', ()), 0) == fallbacks + 1
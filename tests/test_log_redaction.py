@@ -0,0 +1,30 @@
+"""redact() masks contact details in log lines but leaves paths, ids and timestamps alone"""
+import pytest
+
+import app
+
+
+@pytest.mark.parametrize('text', [
+    'call +1 234 567 8900 now',
+    '"phone": "+91-98765-43210"',
+    'phone 98765 43210',
+    '(555) 123-4567',
+    'tel:+44 20 7946 0958',
+])
+def test_phone_numbers_are_masked(text):
+    assert '[phone]' in app.redact(text)
+
+
+@pytest.mark.parametrize('text', [
+    '/api/resumes/12345678901',
+    '/api/resumes/12345678901/versions',
+    'job-12345678901',
+    '2024-01-01 00:00:00',
+    '2024-01-01T10:00:00.123+00:00',
+])
+def test_paths_ids_and_timestamps_are_kept(text):
+    assert app.redact(text) == text
+
+
+def test_emails_are_masked():
+    assert app.redact('from jane.doe+cv@example.co.in') == 'from [email]'
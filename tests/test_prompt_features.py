@@ -0,0 +1,46 @@
+"""Keyword matching of extract_prompt_features and detect_content_type"""
+import pytest
+
+import app
+
+
+def features(text):
+    app.extract_prompt_features.cache_clear()
+    return app.extract_prompt_features(text)
+
+
+@pytest.mark.parametrize('text, feature', [
+    ('I designed the college fest posters', 'title_design'),
+    ('Designs and ships mobile apps', 'title_design'),
+    ('Engineered the billing service', 'title_engineering'),
+    ('Led a team of creatives', 'title_design'),
+    ('Two internships at startups', 'experience'),
+    ('Worked at two companies', 'experience'),
+    ('Took evening courses at two universities', 'education'),
+    ('B.C.A. from Medicaps', 'education'),
+])
+def test_inflected_keywords_match(text, feature):
+    assert features(text).get(feature)
+
+
+@pytest.mark.parametrize('text, feature', [
+    ('Started a startup', 'title_design'),
+    ('Jobert Smith', 'experience'),
+    ('Company-wide hackathon', 'title_engineering'),
+])
+def test_words_containing_keywords_do_not_match(text, feature):
+    assert not features(text).get(feature)
+
+
+def test_listed_spellings_keep_their_own_keyword():
+    assert features('engineering student') == {'title_engineering': 1, 'education': 1}
+
+
+@pytest.mark.parametrize('text, content_type', [
+    ('BCA student at Medicaps University', 'education'),
+    ('Worked 3 years as an engineer at two companies', 'experience'),
+    ('Designed a portfolio', 'mixed'),
+])
+def test_detect_content_type(text, content_type):
+    app.extract_prompt_features.cache_clear()
+    assert app.detect_content_type(text) == content_type
@@ -0,0 +1,24 @@
+"""Summary section of finalize_resume_section: defaults and minimum length"""
+import pytest
+
+import app
+
+
+@pytest.mark.parametrize('value', ['', None])
+def test_missing_summary_uses_the_default_text(value):
+    data = {'experienceLevel': 'Student', 'stream': 'Commerce'}
+    summary = app.finalize_resume_section('summary', app.coerce_resume_section('summary', value), data)
+    assert summary.startswith('A dedicated student with strong educational background in commerce.')
+    assert summary == summary.strip()
+    assert len(summary.split()) >= 50
+
+
+def test_missing_form_fields_still_give_a_summary():
+    summary = app.finalize_resume_section('summary', '', {'stream': None, 'experienceLevel': ['Student']})
+    assert summary.startswith('A dedicated individual with strong educational background in general studies.')
+
+
+def test_written_summary_is_kept_and_padded():
+    summary = app.finalize_resume_section('summary', 'Backend developer.', {})
+    assert summary.startswith('Backend developer. Strong foundation')
+    assert len(summary.split()) >= 50
@@ -0,0 +1,20 @@
+"""canonicalize_skills: catalog spellings collapse, distinct skills stay apart"""
+import pytest
+
+import app
+
+
+@pytest.mark.parametrize('skills, expected', [
+    (['Python Programming', 'python', 'PYTHON'], ['Python']),
+    (['SQL Database', 'SQL'], ['SQL']),
+    (['JS', 'JavaScript'], ['JavaScript']),
+    (['Design Graphic', 'graphic design'], ['Graphic Design']),
+    (['Machine  learning', 'ML'], ['Machine Learning']),
+    (['Web Development', 'Web Frameworks', 'Web Services'], ['Web Development', 'Web Frameworks', 'Web Services']),
+    (['Java Frameworks', 'Java'], ['Java Frameworks', 'Java']),
+    (['Data Skills', 'Data'], ['Data Skills', 'Data']),
+    (['Web  Scraping', 'web scraping'], ['Web Scraping']),
+    (['Python', '', '  ', None, 3], ['Python']),
+])
+def test_canonicalize_skills(skills, expected):
+    assert app.canonicalize_skills(skills) == expected